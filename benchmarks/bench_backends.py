@@ -0,0 +1,68 @@
+# benchmarks/bench_backends.py
+#
+# Quality vs latency of the summarizer backends on a fixed local corpus.
+# ROUGE-L F1 is measured against the fp32 PyTorch outputs.
+#
+#   python -m benchmarks.bench_backends --items 32 --backends pytorch int8 onnx
+
+import argparse
+import time
+from typing import List
+
+from benchmarks.bench_summarizer import make_items
+from src.processors import model_registry
+from src.processors.model_registry import SUMMARIZER_MODEL, get_pipeline, unload
+
+def _lcs(a: List[str], b: List[str]) -> int:
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+def rouge_l(reference: str, candidate: str) -> float:
+    ref, cand = reference.lower().split(), candidate.lower().split()
+    if not ref or not cand:
+        return 0.0
+    lcs = _lcs(ref, cand)
+    if not lcs:
+        return 0.0
+    precision, recall = lcs / len(cand), lcs / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+def summarize_all(texts: List[str], backend: str) -> (List[str], float):
+    pipe = get_pipeline(SUMMARIZER_MODEL, backend=backend)
+    pipe(texts[0], max_length=33, min_length=30, do_sample=False)  # warm-up
+    start = time.perf_counter()
+    outputs = [pipe(text, max_length=33, min_length=30, do_sample=False, truncation=True)[0]["summary_text"]
+               for text in texts]
+    return outputs, (time.perf_counter() - start) / len(texts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarizer backend quality/latency report")
+    parser.add_argument("--items", type=int, default=32)
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "int8", "onnx"])
+    args = parser.parse_args()
+
+    texts = [item.content for item in make_items(args.items, seed=42)]
+    reference, reference_latency = summarize_all(texts, "pytorch")
+    unload(SUMMARIZER_MODEL)
+
+    print(f"{'backend':<10}{'ms/item':>10}{'speedup':>9}{'ROUGE-L':>9}")
+    for backend in args.backends:
+        if backend == "pytorch":
+            outputs, latency = reference, reference_latency
+        else:
+            outputs, latency = summarize_all(texts, backend)
+            if model_registry.get_backend(SUMMARIZER_MODEL) != backend:
+                print(f"{backend:<10}{'unavailable (fell back to pytorch)':>28}")
+                unload(SUMMARIZER_MODEL)
+                continue
+            unload(SUMMARIZER_MODEL)
+        score = sum(rouge_l(ref, out) for ref, out in zip(reference, outputs)) / len(texts)
+        print(f"{backend:<10}{latency * 1000:>10.1f}{reference_latency / latency:>8.2f}x{score:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_diagrams.py
+#
+# Architecture extraction throughput: the previous per-keyword substring scan
+# against the compiled vocabulary matcher, and how the matcher scales with
+# vocabulary size and text length.
+#
+#   python -m benchmarks.bench_diagrams --papers 10000
+
+import argparse
+import random
+
+from benchmarks.common import timed
+from benchmarks.synthetic import paper_items, vocabulary
+from src.processors.diagram_generator import ARCHITECTURE_VOCABULARY, ArchitectureMatcher
+
+LEGACY_KEYWORDS = ["input", "embedding", "encoder", "decoder", "attention", "classifier", "output"]
+
+def legacy_extract(summary: str):
+    # The previous extract_flowchart_steps: lowercase per keyword, fixed list order
+    steps = []
+    for word in LEGACY_KEYWORDS:
+        if word in summary.lower():
+            steps.append(word.title())
+    return list(dict.fromkeys(steps))
+
+def padded_vocabulary(extra_terms: int, seed: int = 0):
+    # Built-in vocabulary plus made-up one- to three-word terms from the fixtures' words
+    rng = random.Random(seed)
+    words = vocabulary()
+    padded = {label: list(synonyms) for label, synonyms in ARCHITECTURE_VOCABULARY.items()}
+    for i in range(extra_terms):
+        padded[f"Term {i}"] = [" ".join(rng.choices(words, k=rng.randint(1, 3)))]
+    return padded
+
+def main():
+    parser = argparse.ArgumentParser(description="Architecture extraction throughput")
+    parser.add_argument("--papers", type=int, default=10_000)
+    args = parser.parse_args()
+    texts = [paper.content for paper in paper_items(args.papers)]
+    megabytes = sum(len(text) for text in texts) / 1e6
+
+    matcher = ArchitectureMatcher(ARCHITECTURE_VOCABULARY)
+    legacy = timed(lambda: [legacy_extract(text) for text in texts])
+    current = timed(lambda: [matcher.extract(text) for text in texts])
+    # More terms also means more mentions in the text; per-mention work is what grows
+    print(f"{'extractor':<28}{'terms':>8}{'mentions':>10}{'seconds':>10}{'papers/s':>12}{'MB/s':>8}")
+    print(f"{'previous keyword scan':<28}{len(LEGACY_KEYWORDS):>8}{'-':>10}{legacy:>10.3f}"
+          f"{args.papers / legacy:>12.0f}{megabytes / legacy:>8.1f}")
+    for extra in (0, 1_000, 10_000):
+        matcher = ArchitectureMatcher(padded_vocabulary(extra))
+        elapsed = timed(lambda: [matcher.extract(text) for text in texts])
+        mentions = sum(len(matcher.find(text.lower())) for text in texts)
+        print(f"{'compiled matcher':<28}{len(matcher.labels):>8}{mentions:>10}{elapsed:>10.3f}"
+              f"{args.papers / elapsed:>12.0f}{megabytes / elapsed:>8.1f}")
+
+    print(f"\n{'text length':<28}{'seconds':>10}{'MB/s':>8}")
+    matcher = ArchitectureMatcher(ARCHITECTURE_VOCABULARY)
+    for count in (250, 1_000, 4_000):
+        document = " ".join(texts[:count])  # one long text, e.g. a full paper
+        elapsed = timed(lambda: matcher.extract(document))
+        print(f"{len(document):<28}{elapsed:>10.3f}{len(document) / 1e6 / elapsed:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# benchmarks/bench_parallel.py
+#
+# Throughput of process-pool summarization as the worker count grows.
+#
+#   python -m benchmarks.bench_parallel --items 128 --max-workers 8
+
+import argparse
+import os
+import time
+
+from benchmarks.bench_summarizer import make_items
+from src.processors.parallel import shutdown_pool, get_pool, default_torch_threads
+from src.processors.summarizer import summarize_content
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarization throughput for 1..N worker processes")
+    parser.add_argument("--items", type=int, default=128)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    counts, workers = [], 1
+    while workers <= args.max_workers:
+        counts.append(workers)
+        workers *= 2
+
+    print(f"{'workers':>8}{'threads':>9}{'seconds':>10}{'items/s':>10}{'speedup':>9}")
+    baseline = None
+    for workers in counts:
+        if workers > 1:
+            get_pool(workers)  # exclude worker start-up and model loading from the timing
+        items = make_items(args.items, seed=workers)
+        start = time.perf_counter()
+        summarize_content(items, use_cache=False, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        threads = default_torch_threads(workers) if workers > 1 else "-"
+        print(f"{workers:>8}{threads:>9}{elapsed:>10.2f}{args.items / elapsed:>10.2f}{baseline / elapsed:>8.2f}x")
+        shutdown_pool()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_storage.py
+#
+# Micro-benchmark for inserting news rows into SQLite.
+#
+#   python -m benchmarks.bench_storage --rows 10000
+
+import argparse
+import os
+import sqlite3
+import tempfile
+
+from benchmarks.common import timed
+from src.pipeline.records import NewsItem
+from src.storage import database
+
+def make_rows(n: int):
+    return [
+        NewsItem(
+            title=f"headline {i}",
+            url=f"https://example.com/{i}",
+            published="2025-06-22T12:00:00Z",
+            source="bench",
+            summary="summary text " * 10,
+            score=i / n,
+        )
+        for i in range(n)
+    ]
+
+def legacy_save(path: str, items):
+    # The previous save_to_db: reconnect and execute once per row
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    for item in items:
+        c.execute("""
+            INSERT OR IGNORE INTO news (title, url, source, published_at, summary, diagram, score)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (item.title, item.url, item.source, item.published,
+              item.summary, item.diagram, item.score))
+    conn.commit()
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite insert throughput")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=10, help="items per save call (pipeline saves small batches)")
+    args = parser.parse_args()
+    items = make_rows(args.rows)
+    batches = [items[i:i + args.batch] for i in range(0, len(items), args.batch)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "legacy.db")
+        database.init_db()
+        database.get_db().conn.execute("PRAGMA journal_mode=DELETE")  # the old default journal
+        database.get_db().close()
+        database._db = None
+        legacy_path = os.path.join(tmp, "legacy.db")
+        legacy = timed(lambda: [legacy_save(legacy_path, batch) for batch in batches])
+
+        database.DB_PATH = os.path.join(tmp, "bulk.db")
+        database.init_db()
+        bulk = timed(lambda: [database.get_db().save_items("news", batch) for batch in batches])
+        upsert = timed(lambda: database.get_db().save_items("news", items))
+        database.get_db().close()
+
+    print(f"{'mode':<26}{'seconds':>10}{'rows/s':>12}")
+    print(f"{'per-row, reconnect':<26}{legacy:>10.3f}{args.rows / legacy:>12.0f}")
+    print(f"{'executemany, WAL':<26}{bulk:>10.3f}{args.rows / bulk:>12.0f}")
+    print(f"{'upsert all rows at once':<26}{upsert:>10.3f}{args.rows / upsert:>12.0f}")
+
+if __name__ == "__main__":
+    main()
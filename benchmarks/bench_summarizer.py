@@ -0,0 +1,55 @@
+# benchmarks/bench_summarizer.py
+#
+# Compares per-item and batched BART summarization throughput.
+#
+#   python -m benchmarks.bench_summarizer --items 64 --batch-size 8
+
+import argparse
+import random
+import time
+
+from src.pipeline.records import NewsItem
+from src.processors.summarizer import summarize_content
+
+SENTENCES = [
+    "Researchers introduced a new large language model trained on curated web data.",
+    "The model uses a transformer encoder with sparse attention to reduce memory use.",
+    "Evaluation on standard benchmarks shows gains in accuracy and calibration.",
+    "The authors release code and weights under a permissive license.",
+    "Critics note that the dataset may contain biased or low-quality samples.",
+    "Industry analysts expect rapid adoption in enterprise search products.",
+]
+
+def make_items(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        NewsItem(title=f"item {i}", url=f"https://example.com/{i}", published="",
+                 content=" ".join(rng.choices(SENTENCES, k=rng.randint(3, 30))))
+        for i in range(n)
+    ]
+
+def run(method: str, n: int, **kwargs) -> float:
+    items = make_items(n)
+    start = time.perf_counter()
+    # Both modes summarize the same texts; without the cache the second would be all hits
+    summarize_content(items, method=method, use_cache=False, **kwargs)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-item vs batched summarization throughput")
+    parser.add_argument("--items", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-batch-tokens", type=int, default=4096)
+    args = parser.parse_args()
+
+    single = run("huggingface-single", args.items)
+    batched = run("huggingface", args.items, batch_size=args.batch_size,
+                  max_batch_tokens=args.max_batch_tokens)
+
+    print(f"{'mode':<12}{'seconds':>10}{'items/s':>10}")
+    print(f"{'per-item':<12}{single:>10.2f}{args.items / single:>10.2f}")
+    print(f"{'batched':<12}{batched:>10.2f}{args.items / batched:>10.2f}")
+    print(f"speedup: {single / batched:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# benchmarks/common.py
+#
+# Helpers shared by the benchmark scripts.
+
+import time
+from typing import Callable
+
+def timed(fn: Callable[[], object]) -> float:
+    """
+    Returns the wall time of one call to `fn`, in seconds.
+    """
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
@@ -0,0 +1,235 @@
+# benchmarks/run_suite.py
+#
+# Offline benchmark suite: replays recorded/synthetic NewsAPI and arXiv data
+# through each pipeline stage and reports items/s per stage and size. Models
+# are replaced by the stand-ins in stand_ins.py, and all state (SQLite, cache,
+# vectors) lives in a temporary directory, so no network or GPU is needed.
+#
+#   python -m benchmarks.run_suite --sizes 1000,10000 --output bench.json
+#   python -m benchmarks.run_suite --sizes 1000,10000 --compare bench.json
+#
+# --compare exits with status 1 if any benchmark is slower than the baseline
+# by more than --tolerance.
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks import stand_ins
+from benchmarks.synthetic import (
+    atom_payload, news_items, newsapi_payload, paper_items, synthetic_articles, synthetic_papers
+)
+from src.collectors import async_collector
+from src.collectors.news_collector import parse_news_articles
+from src.collectors.paper_collector import parse_arxiv_feed
+from src.pipeline.records import Item
+from src.processors.cleaner import clean_and_deduplicate
+from src.processors.diagram_generator import generate_mermaid_diagrams
+from src.processors.summarizer import summarize_content, extract_insights_batch
+from src.ranking import ranker, relevance
+from src.storage import cache, database, http_cache
+
+# Benchmarks that are slow per item only run up to this many items
+MAX_ITEMS = {"parse_arxiv": 10_000, "collect": 20_000, "summarize": 10_000, "insights": 10_000}
+
+# A benchmark is (setup(n) -> state, run(state) -> items processed); only run() is timed
+Benchmark = Tuple[Callable[[int], object], Callable[[object], int]]
+
+def fresh_state(tmp: str, label: str):
+    """
+    Points the database and inference cache at new files and clears in-memory
+    caches, so every repetition starts cold.
+    """
+    cache.close()
+    cache._conn = None
+    cache.CACHE_PATH = os.path.join(tmp, f"cache-{label}.db")
+    database.DB_PATH = os.path.join(tmp, f"db-{label}.db")
+    http_cache.close()
+    http_cache.HTTP_CACHE_PATH = os.path.join(tmp, f"http-{label}.db")
+    relevance._memory_cache.clear()
+    relevance._profile_cache.clear()
+    ranker.parse_timestamp.cache_clear()
+
+def _copies(items: List[Item]) -> List[Item]:
+    return [copy.copy(item) for item in items]
+
+def _replay_collect(state) -> int:
+    news_pages, paper_pages, n = state
+    from aiohttp import web
+
+    async def newsapi(request):
+        return web.Response(body=news_pages[int(request.query["page"])], content_type="application/json")
+
+    async def arxiv(request):
+        return web.Response(body=paper_pages[int(request.query["start"])], content_type="application/atom+xml")
+
+    async def replay():
+        app = web.Application()
+        app.router.add_get("/v2/everything", newsapi)
+        app.router.add_get("/api/query", arxiv)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            news, papers = await async_collector.collect_all_async(
+                max_news=n, max_papers=n, api_key="bench",
+                news_url=f"http://127.0.0.1:{port}/v2/everything", arxiv_url=f"http://127.0.0.1:{port}/api/query")
+        finally:
+            await runner.cleanup()
+        return len(news) + len(papers)
+
+    return asyncio.run(replay())
+
+def _setup_collect(n: int):
+    for settings in async_collector.SOURCE_SETTINGS.values():
+        settings["min_interval"] = 0.0  # no politeness delay against the local replay server
+    articles, papers = synthetic_articles(n), synthetic_papers(n)
+    news_pages = {page: newsapi_payload(articles[(page - 1) * 100:page * 100]) for page in range(1, -(-n // 100) + 1)}
+    paper_pages = {start: atom_payload(papers[start:start + 100]) for start in range(0, n, 100)}
+    return news_pages, paper_pages, n
+
+def _scored(n: int) -> List[Item]:
+    items = news_items(n)
+    for i, item in enumerate(items):
+        item.relevance_score = (i * 7919 % 1000) / 1000
+    return items
+
+def _run_clean(items: List[Item]) -> int:
+    clean_and_deduplicate(_copies(items))
+    return len(items)
+
+def _run_dedup(items: List[Item]) -> int:
+    clean_and_deduplicate(_copies(items), near_duplicate_threshold=0.8)
+    return len(items)
+
+def _run_rank(items: List[Item]) -> int:
+    ranker.rank_items(items, top_k=5)
+    return len(items)
+
+def _run_storage(items: List[Item]) -> int:
+    db = database.get_db()
+    for start in range(0, len(items), 100):  # the pipeline stores one page at a time
+        db.save_items("news", items[start:start + 100])
+    return len(items)
+
+def _run_summarize(items: List[Item]) -> int:
+    return len(summarize_content(_copies(items), content_type="paper", use_cache=False, workers=1))
+
+def _run_diagrams(items: List[Item]) -> int:
+    return len(generate_mermaid_diagrams(_copies(items), use_cache=False))
+
+def _run_insights(summaries: List[str]) -> int:
+    return len(extract_insights_batch(summaries, workers=1))
+
+def _run_relevance(items: List[Item]) -> int:
+    return len(relevance.score_relevance(_copies(items)))
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "parse_news": (lambda n: json.dumps({"articles": synthetic_articles(n)}),
+                   lambda payload: len(parse_news_articles(json.loads(payload)["articles"]))),
+    "parse_arxiv": (lambda n: atom_payload(synthetic_papers(n)), lambda payload: len(parse_arxiv_feed(payload))),
+    "collect": (_setup_collect, _replay_collect),
+    "clean": (news_items, _run_clean),
+    "dedup": (news_items, _run_dedup),
+    "rank": (_scored, _run_rank),
+    "storage": (news_items, _run_storage),
+    "summarize": (paper_items, _run_summarize),
+    "diagrams": (paper_items, _run_diagrams),
+    "insights": (lambda n: [" ".join(p.content.split()[:60]) for p in paper_items(n)], _run_insights),
+    "relevance": (news_items, _run_relevance),
+}
+
+def measure(name: str, n: int, repeat: int, tmp: str) -> Optional[Dict]:
+    if n > MAX_ITEMS.get(name, n):
+        return None
+    setup, run = BENCHMARKS[name]
+    state = setup(n)
+    times = []
+    for attempt in range(repeat):
+        fresh_state(tmp, f"{name}-{n}-{attempt}")
+        start = time.perf_counter()
+        processed = run(state)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {"benchmark": name, "n": n, "processed": processed, "seconds": round(best, 5),
+            "median_seconds": round(statistics.median(times), 5), "items_per_sec": round(processed / best, 1)}
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "machine": platform.machine(),
+            "platform": platform.platform(), "cpus": os.cpu_count(),
+            "timestamp": datetime.now(timezone.utc).isoformat()}
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> bool:
+    """
+    Prints items/s against a baseline report; returns True if nothing regressed.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["benchmark"], r["n"]): r for r in json.load(f)["results"]}
+
+    ok = True
+    print(f"\n{'benchmark':<14}{'n':>8}{'baseline/s':>13}{'now/s':>12}{'change':>9}")
+    for result in results:
+        previous = baseline.get((result["benchmark"], result["n"]))
+        if previous is None:
+            continue
+        change = result["items_per_sec"] / previous["items_per_sec"] - 1
+        flag = ""
+        if change < -tolerance:
+            flag, ok = "  REGRESSION", False
+        print(f"{result['benchmark']:<14}{result['n']:>8}{previous['items_per_sec']:>13.0f}"
+              f"{result['items_per_sec']:>12.0f}{change:>+9.1%}{flag}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline per-stage pipeline benchmarks")
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated item counts (up to 100000)")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="comma-separated benchmark names")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the fastest is reported")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before failing")
+    args = parser.parse_args()
+
+    stand_ins.install()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = []
+
+    print(f"{'benchmark':<14}{'n':>8}{'seconds':>10}{'items/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.only.split(","):
+            for n in sizes:
+                result = measure(name, n, args.repeat, tmp)
+                if result is None:
+                    print(f"{name:<14}{n:>8}{'skipped':>10}")
+                    continue
+                results.append(result)
+                print(f"{name:<14}{n:>8}{result['seconds']:>10.3f}{result['items_per_sec']:>12.0f}")
+        cache.close()
+        database.get_db().close()
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# benchmarks/synthetic.py
+#
+# Recorded API fixtures and synthetic generators built from them.
+#
+# benchmarks/fixtures/ holds one NewsAPI /everything response and one arXiv
+# Atom feed. The generators reuse their structure and vocabulary to produce
+# 1k-100k items (with a controlled share of exact and near duplicates) as
+# parsed items or as raw response bodies for replaying through the collectors.
+#
+# Refresh the recorded fixtures from the live APIs (needs network + NewsAPI key):
+#
+#   python -m benchmarks.synthetic --record
+
+import argparse
+import copy
+import json
+import os
+import random
+import re
+from functools import lru_cache
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+from src.pipeline.records import NewsItem, PaperItem
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+NEWS_FIXTURE = os.path.join(FIXTURE_DIR, "newsapi_everything.json")
+ARXIV_FIXTURE = os.path.join(FIXTURE_DIR, "arxiv_query.atom")
+
+ATOM_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title type="html">ArXiv Query: synthetic</title>
+  <id>http://arxiv.org/api/synthetic</id>
+  <updated>2025-06-23T00:00:00-04:00</updated>
+"""
+
+ATOM_ENTRY = """  <entry>
+    <id>http://arxiv.org/abs/{arxiv_id}v1</id>
+    <updated>{published}</updated>
+    <published>{published}</published>
+    <title>{title}</title>
+    <summary>{summary}</summary>
+{authors}    <link href="http://arxiv.org/abs/{arxiv_id}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/{arxiv_id}v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="{category}" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="{category}" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+"""
+
+CATEGORIES = ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "stat.ML"]
+
+def load_news_fixture() -> Dict:
+    with open(NEWS_FIXTURE, encoding="utf-8") as f:
+        return json.load(f)
+
+def load_arxiv_fixture() -> bytes:
+    with open(ARXIV_FIXTURE, "rb") as f:
+        return f.read()
+
+@lru_cache(maxsize=1)
+def vocabulary() -> List[str]:
+    """
+    Returns the distinct words of the recorded fixtures, sorted.
+    """
+    fixture = load_news_fixture()
+    text = " ".join(f"{a['title']} {a['description'] or ''} {a['content'] or ''}" for a in fixture["articles"])
+    text += " " + re.sub(r"<[^>]+>", " ", load_arxiv_fixture().decode("utf-8"))
+    return sorted({word for word in re.findall(r"[A-Za-z][A-Za-z-]{2,}", text)})
+
+def _perturb(text: str, rng: random.Random, vocabulary: List[str], edits: int = 2) -> str:
+    # Swap a couple of words: still a near duplicate at Jaccard ~0.8+
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    return " ".join(words)
+
+def synthetic_articles(n: int, seed: int = 0, duplicate_rate: float = 0.05,
+                       near_duplicate_rate: float = 0.05) -> List[Dict]:
+    """
+    Generates raw NewsAPI articles shaped like the recorded fixture.
+
+    Args:
+        n (int): Number of articles.
+        seed (int): RNG seed; the same seed always yields the same articles.
+        duplicate_rate (float): Share of exact copies (same title and content, new URL).
+        near_duplicate_rate (float): Share of lightly edited copies (syndicated rewrites).
+
+    Returns:
+        List[Dict]: Articles in NewsAPI response format.
+    """
+    rng = random.Random(seed)
+    words = vocabulary()
+    templates = load_news_fixture()["articles"]
+    articles = []
+
+    for i in range(n):
+        template = templates[i % len(templates)]
+        roll = rng.random()
+        if articles and roll < duplicate_rate:
+            article = copy.deepcopy(rng.choice(articles))
+        elif articles and roll < duplicate_rate + near_duplicate_rate:
+            article = copy.deepcopy(rng.choice(articles))
+            article["content"] = _perturb(article["content"], rng, words)
+        else:
+            body = " ".join(rng.choices(words, k=rng.randint(40, 90)))
+            article = {
+                "source": dict(template["source"]),
+                "author": template["author"],
+                "title": " ".join(rng.choices(words, k=rng.randint(6, 12))).capitalize(),
+                "description": body[:200],
+                "url": "",
+                "urlToImage": template["urlToImage"],
+                "publishedAt": f"2025-06-{rng.randint(1, 22):02d}T{rng.randint(0, 23):02d}:"
+                               f"{rng.randint(0, 59):02d}:00Z",
+                "content": f"{body}… [+{rng.randint(1000, 6000)} chars]",
+            }
+        article["url"] = f"https://news.example.com/{seed}/{i}"
+        articles.append(article)
+    return articles
+
+def newsapi_payload(articles: List[Dict]) -> bytes:
+    return json.dumps({"status": "ok", "totalResults": len(articles), "articles": articles}).encode("utf-8")
+
+def synthetic_papers(n: int, seed: int = 0, near_duplicate_rate: float = 0.02) -> List[Dict]:
+    """
+    Generates arXiv paper records (id, title, summary, authors, published, category).
+    """
+    rng = random.Random(seed)
+    words = vocabulary()
+    papers = []
+    for i in range(n):
+        if papers and rng.random() < near_duplicate_rate:
+            paper = dict(rng.choice(papers))
+            paper["summary"] = _perturb(paper["summary"], rng, words)
+        else:
+            paper = {
+                "title": " ".join(rng.choices(words, k=rng.randint(6, 14))).capitalize(),
+                "summary": " ".join(rng.choices(words, k=rng.randint(120, 220))),
+                "authors": [f"Author {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 6))],
+                "published": f"2025-06-{rng.randint(1, 22):02d}T{rng.randint(0, 23):02d}:"
+                             f"{rng.randint(0, 59):02d}:00Z",
+                "category": rng.choice(CATEGORIES),
+            }
+        paper["arxiv_id"] = f"2506.{seed % 10}{i:06d}"
+        papers.append(paper)
+    return papers
+
+def atom_payload(papers: List[Dict]) -> bytes:
+    """
+    Renders paper records as an arXiv API Atom feed.
+    """
+    entries = [ATOM_ENTRY.format(
+        arxiv_id=paper["arxiv_id"], published=paper["published"], title=escape(paper["title"]),
+        summary=escape(paper["summary"]), category=paper["category"],
+        authors="".join(f"    <author>\n      <name>{escape(name)}</name>\n    </author>\n"
+                        for name in paper["authors"]),
+    ) for paper in papers]
+    return (ATOM_HEADER + "".join(entries) + "</feed>\n").encode("utf-8")
+
+def news_items(n: int, seed: int = 0) -> List[NewsItem]:
+    """
+    Synthetic articles already converted to pipeline news items.
+    """
+    from src.collectors.news_collector import parse_news_articles
+    return parse_news_articles(synthetic_articles(n, seed))
+
+def paper_items(n: int, seed: int = 0) -> List[PaperItem]:
+    """
+    Synthetic papers as pipeline paper items (without going through feedparser).
+    """
+    return [PaperItem(
+        title=paper["title"],
+        url=f"http://arxiv.org/abs/{paper['arxiv_id']}v1",
+        published=paper["published"],
+        content=paper["summary"],
+        source="arxiv",
+        arxiv_id=f"{paper['arxiv_id']}v1",
+        authors=paper["authors"],
+        categories=[paper["category"]],
+    ) for paper in synthetic_papers(n, seed)]
+
+def record():
+    """
+    Re-records both fixtures from the live APIs.
+    """
+    import requests
+    from src.collectors.news_collector import NEWS_API_URL, DEFAULT_NEWS_QUERY, build_news_params, load_api_key
+    from src.collectors.paper_collector import DEFAULT_PAPER_QUERY, build_arxiv_url
+
+    params = build_news_params(DEFAULT_NEWS_QUERY, 10, load_api_key())
+    response = requests.get(NEWS_API_URL, params=params, timeout=15)
+    response.raise_for_status()
+    with open(NEWS_FIXTURE, "w", encoding="utf-8") as f:
+        json.dump(response.json(), f, indent=2, ensure_ascii=False)
+
+    response = requests.get(build_arxiv_url(DEFAULT_PAPER_QUERY, 5), timeout=30)
+    response.raise_for_status()
+    with open(ARXIV_FIXTURE, "wb") as f:
+        f.write(response.content)
+    print(f"Recorded fixtures in {FIXTURE_DIR}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fixtures and synthetic data")
+    parser.add_argument("--record", action="store_true", help="re-record fixtures from the live APIs")
+    parser.add_argument("--sample", type=int, default=0, help="print N synthetic news items")
+    args = parser.parse_args()
+    if args.record:
+        record()
+    for item in news_items(args.sample):
+        print(json.dumps(item.to_dict(), ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
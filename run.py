@@ -1,63 +1,124 @@
 # run.py
 
+import argparse
 import logging
-from src.collectors.news_collector import fetch_latest_news
-from src.collectors.paper_collector import fetch_latest_papers
-from src.processors.cleaner import clean_and_deduplicate
-from src.processors.summarizer import summarize_content, extract_insights_with_flan
-from src.ranking.ranker import rank_items
-from src.storage.database import save_to_db
-from src.processors.diagram_generator import generate_mermaid_diagram
+import time
+from src.pipeline import metrics
+from src.pipeline.daemon import run_daemon
+from src.pipeline.streaming import run_streaming_pipeline
+from src.pipeline.workers import coordinate, enqueue_collected, run_local, run_worker
+from src.processors.model_registry import warm_models
+from src.storage import cache, http_cache
+from src.storage.database import mark_run_completed
 
 
 # Optional: streamlit or flask can be triggered here or elsewhere
 # from src.ui.dashboard import launch_dashboard
 
-def main():
+def setup_logging():
     logging.basicConfig(
         filename='logs/pipeline.log',
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
+def run_pipeline() -> str:
+    """
+    Runs the pipeline once and records its metrics.
+
+    Returns:
+        str: "ok" or "failed".
+    """
     logging.info("Pipeline started.")
+    metrics.start_run()
+    started = time.time()
+    status = "failed"
 
     try:
-        # Step 1: Collect content
-        news = fetch_latest_news()
-        papers = fetch_latest_papers()
-
-        # Step 2: Preprocess
-        cleaned_news = clean_and_deduplicate(news)
-        cleaned_papers = clean_and_deduplicate(papers)
-
-        # Step 3: Summarize
-        summarized_news = summarize_content(cleaned_news, content_type="news")
-        summarized_papers = summarize_content(cleaned_papers, content_type="paper")
-
-
-        for paper in summarized_papers:
-            generate_mermaid_diagram(paper)
-                # After summarizing papers
-        for paper in summarized_papers:
-            insights = extract_insights_with_flan(paper["summary"])
-            logging.info(insights)
-            paper["insights"] = insights
-        # Step 4: Rank
-        top_news = rank_items(summarized_news, top_k=5)
-        top_papers = rank_items(summarized_papers, top_k=5)
-
-        # Step 5: Store
-        save_to_db("news", top_news)
-        save_to_db("papers", top_papers)
+        # Collect, clean, summarize, enrich, rank and store as overlapping stages
+        results = run_streaming_pipeline(top_k=5)
+        if any(results.values()):
+            mark_run_completed()
+
+        cache.log_stats()
+        cache.evict()
+        http_cache.log_stats()
+        http_cache.evict()
 
         # (Optional Step) Serve or display results
         # launch_dashboard()
 
         logging.info("Pipeline completed successfully.")
+        status = "ok"
 
     except Exception as e:
         logging.exception("Pipeline failed: %s", str(e))
+        # Responses fetched by this run were never stored; make the next run process them again
+        http_cache.forget_since(started)
+
+    finally:
+        # Per-stage timings, throughput, cache hits and peak RSS for this run
+        metrics.finish_run(status)
+    return status
+
+def main():
+    setup_logging()
+
+    # Load models in the background while collection waits on the network
+    warm_models()
+    run_pipeline()
+
+def daemon(interval: float = None, jitter: float = None, port: int = None):
+    """
+    Keeps models and the DB connection resident and runs the pipeline every
+    `interval` seconds (see src/pipeline/daemon.py).
+    """
+    setup_logging()
+    run_daemon(run_pipeline, interval=interval, jitter=jitter, port=port)
+
+def distributed(role: str, workers: int = 2) -> str:
+    """
+    Runs one role of the work-queue pipeline (see src/pipeline/workers.py):
+    'enqueue' collects into the queue, 'worker' processes it until empty,
+    'coordinate' ranks and stores completed items, and 'local' does all three
+    with `workers` worker processes on this machine.
+
+    Returns:
+        str: "ok" or "failed".
+    """
+    setup_logging()
+    logging.info(f"Distributed role '{role}' started.")
+    metrics.start_run()
+    status = "failed"
+    try:
+        if role == "enqueue":
+            enqueue_collected()
+        elif role == "worker":
+            run_worker()
+        else:
+            results = coordinate(top_k=5) if role == "coordinate" else run_local(workers, top_k=5)
+            if any(results.values()):
+                mark_run_completed()
+        status = "ok"
+    except Exception as e:
+        logging.exception(f"Distributed role '{role}' failed: {e}")
+    finally:
+        metrics.finish_run(status)
+    return status
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="AI/ML news and paper pipeline")
+    parser.add_argument("--daemon", action="store_true", help="run on a schedule instead of once")
+    parser.add_argument("--interval", type=float, help="seconds between runs in daemon mode")
+    parser.add_argument("--jitter", type=float, help="random spread of the interval (fraction)")
+    parser.add_argument("--port", type=int, help="port of the daemon's health/trigger endpoint")
+    parser.add_argument("--role", choices=["enqueue", "worker", "coordinate", "local"],
+                        help="run one role of the work-queue pipeline instead of the whole run")
+    parser.add_argument("--workers", type=int, default=2, help="worker processes for --role local")
+    args = parser.parse_args()
+    if args.role:
+        distributed(args.role, args.workers)
+    elif args.daemon:
+        daemon(args.interval, args.jitter, args.port)
+    else:
+        main()
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import aiohttp
+from yarl import URL
+
+from src.collectors.news_collector import (
+    NEWS_API_URL, DEFAULT_NEWS_QUERY, build_news_params, load_api_key, parse_news_articles
+)
+from src.collectors.paper_collector import ARXIV_API_URL, DEFAULT_PAPER_QUERY, build_arxiv_url, parse_arxiv_feed
+from src.pipeline import metrics
+from src.pipeline.records import NewsItem, PaperItem
+from src.storage import http_cache
+
+# Per-source settings: request timeout (s), minimum spacing between requests (s), retries
+SOURCE_SETTINGS: Dict[str, Dict[str, float]] = {
+    "newsapi": {"timeout": 15, "min_interval": 0.2, "retries": 3},
+    "arxiv": {"timeout": 30, "min_interval": 3.0, "retries": 3},  # arXiv asks for 3s between calls
+}
+
+class RateLimiter:
+    """
+    Spaces out requests to one source by at least `min_interval` seconds.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._last = 0.0
+
+    async def wait(self):
+        async with self._lock:
+            delay = self._last + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last = time.monotonic()
+
+async def request_with_retry(session: aiohttp.ClientSession, url: str, limiter: RateLimiter,
+                             params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                             timeout: float = 15, retries: int = 3,
+                             backoff: float = 1.0) -> Tuple[int, Mapping[str, str], bytes]:
+    """
+    GETs a URL, retrying timeouts, connection errors, 429 and 5xx with exponential backoff.
+
+    Returns:
+        Tuple[int, Mapping[str, str], bytes]: Status (200 or 304), case-insensitive headers and body.
+    """
+    for attempt in range(retries + 1):
+        await limiter.wait()
+        try:
+            async with session.get(url, params=params, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status == 429 or response.status >= 500:
+                    raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                      status=response.status, message=response.reason)
+                response.raise_for_status()
+                return response.status, response.headers.copy(), await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = getattr(e, "status", None)
+            if attempt == retries or (status is not None and status < 500 and status != 429):
+                raise
+            delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+            # Log only the host: NewsAPI URLs carry the API key as a query parameter
+            reason = f"HTTP {status}" if status else type(e).__name__
+            logging.warning(f"Request to {URL(url).host} failed ({reason}); retrying in {delay:.1f}s.")
+            await asyncio.sleep(delay)
+
+async def fetch_with_retry(session: aiohttp.ClientSession, url: str, limiter: RateLimiter,
+                           params: Optional[Dict] = None, timeout: float = 15, retries: int = 3,
+                           backoff: float = 1.0) -> bytes:
+    """
+    GETs a URL with retries (see request_with_retry) and returns the body.
+    """
+    _, _, body = await request_with_retry(session, url, limiter, params=params, timeout=timeout,
+                                          retries=retries, backoff=backoff)
+    return body
+
+async def fetch_cached(session: aiohttp.ClientSession, url: str, limiter: RateLimiter, source: str,
+                       params: Optional[Dict] = None) -> Tuple[bytes, bool]:
+    """
+    GETs a URL through the on-disk HTTP cache (see storage/http_cache.py).
+
+    Within the source's TTL the cached body is returned without a request;
+    after it, the stored ETag/Last-Modified are sent and a 304 reuses the body.
+
+    Returns:
+        Tuple[bytes, bool]: (body, changed); changed is False for fresh cache
+        hits, 304s and 200s whose body is identical to the cached one.
+    """
+    settings = SOURCE_SETTINGS[source]
+    key = http_cache.cache_key(url, params)
+    entry = http_cache.lookup(key)
+    if http_cache.is_fresh(entry, http_cache.SOURCE_TTLS.get(source, 0)):
+        http_cache.record_fresh_hit()
+        return entry["body"], False
+
+    status, headers, body = await request_with_retry(
+        session, url, limiter, params=params, headers=http_cache.conditional_headers(entry),
+        timeout=settings["timeout"], retries=int(settings["retries"]))
+    if status == 304 and entry is not None:
+        http_cache.touch(key)
+        return entry["body"], False
+    return body, http_cache.store(key, body, headers.get("ETag"), headers.get("Last-Modified"), source=source)
+
+async def deliver_page(on_page: Callable[[List], None], items: List):
+    """
+    Calls `on_page` on a worker thread. A callback that blocks (a full stage
+    queue applying backpressure) then only holds back this page, while the event
+    loop keeps serving the other in-flight requests.
+    """
+    await asyncio.get_running_loop().run_in_executor(None, on_page, items)
+
+async def fetch_news_async(session: aiohttp.ClientSession, queries: List[str], max_results: int = 10,
+                           page_size: int = 100, base_url: str = NEWS_API_URL,
+                           api_key: Optional[str] = None,
+                           on_page: Optional[Callable[[List[NewsItem]], None]] = None,
+                           since: Optional[str] = None, skip_unchanged: bool = True,
+                           on_error: Optional[Callable[[], None]] = None) -> List[NewsItem]:
+    """
+    Fetches every query/page combination from NewsAPI concurrently, optionally
+    only articles published at or after `since`.
+
+    If `on_page` is given it is called with the parsed items of each page as soon
+    as that page arrives (pages are not trimmed to `max_results` in that case).
+    With `skip_unchanged`, pages identical to the previous run's are not passed
+    to `on_page` (their items were already processed). A page that cannot be
+    fetched is logged and skipped, and `on_error` is called.
+    """
+    if max_results <= 0:
+        return []
+    settings = SOURCE_SETTINGS["newsapi"]
+    limiter = RateLimiter(settings["min_interval"])
+    api_key = api_key or load_api_key()
+    page_size = min(page_size, max_results)
+    pages = -(-max_results // page_size)
+
+    async def fetch_page(query: str, page: int) -> List[Dict]:
+        params = build_news_params(query, page_size, api_key, page=page, since=since)
+        try:
+            with metrics.stage("collect_newsapi") as counts:
+                body, changed = await fetch_cached(session, base_url, limiter, "newsapi", params=params)
+                articles = json.loads(body).get("articles", [])
+                counts["items_out"] = len(articles)
+            if on_page and (changed or not skip_unchanged):
+                await deliver_page(on_page, parse_news_articles(articles))
+            return articles
+        except Exception as e:
+            logging.error(f"Failed to fetch news page {page} for '{query[:40]}': {e}")
+            if on_error:
+                on_error()
+            return []
+
+    async def fetch_query(query: str) -> List[Dict]:
+        results = await asyncio.gather(*(fetch_page(query, p) for p in range(1, pages + 1)))
+        return [a for page in results for a in page][:max_results]
+
+    results = await asyncio.gather(*(fetch_query(q) for q in queries))
+    articles = [a for query_articles in results for a in query_articles]
+    logging.info(f"Fetched {len(articles)} news articles.")
+    return parse_news_articles(articles)
+
+async def fetch_papers_async(session: aiohttp.ClientSession, queries: List[str], max_results: int = 10,
+                             page_size: int = 100, base_url: str = ARXIV_API_URL,
+                             on_page: Optional[Callable[[List[PaperItem]], None]] = None,
+                             since: Optional[str] = None, skip_unchanged: bool = True,
+                             on_error: Optional[Callable[[], None]] = None) -> List[PaperItem]:
+    """
+    Fetches every query/page combination from the arXiv API and parses the raw Atom bytes,
+    optionally only papers submitted at or after `since`.
+
+    If `on_page` is given it is called with each page's papers as soon as it arrives
+    (unless the page is unchanged since the last run and `skip_unchanged` is set).
+    A page that cannot be fetched is logged and skipped, and `on_error` is called.
+    """
+    if max_results <= 0:
+        return []
+    settings = SOURCE_SETTINGS["arxiv"]
+    limiter = RateLimiter(settings["min_interval"])
+    page_size = min(page_size, max_results)
+
+    async def fetch_page(query: str, start: int) -> List[PaperItem]:
+        url = build_arxiv_url(query, min(page_size, max_results - start), start=start, base_url=base_url,
+                              since=since)
+        try:
+            with metrics.stage("collect_arxiv") as counts:
+                body, changed = await fetch_cached(session, url, limiter, "arxiv")
+                papers = parse_arxiv_feed(body)
+                counts["items_out"] = len(papers)
+            if on_page and (changed or not skip_unchanged):
+                await deliver_page(on_page, papers)
+            return papers
+        except Exception as e:
+            logging.error(f"Failed to fetch arXiv page at {start} for '{query[:40]}': {e}")
+            if on_error:
+                on_error()
+            return []
+
+    results = await asyncio.gather(*(fetch_page(q, s) for q in queries for s in range(0, max_results, page_size)))
+    papers = [p for page in results for p in page]
+    logging.info(f"Fetched {len(papers)} papers from arXiv.")
+    return papers
+
+async def collect_all_async(news_queries: List[str] = None, paper_queries: List[str] = None,
+                            max_news: int = 10, max_papers: int = 10,
+                            news_url: str = NEWS_API_URL, arxiv_url: str = ARXIV_API_URL,
+                            api_key: Optional[str] = None,
+                            on_news_page: Optional[Callable[[List[NewsItem]], None]] = None,
+                            on_papers_page: Optional[Callable[[List[PaperItem]], None]] = None,
+                            news_since: Optional[str] = None, papers_since: Optional[str] = None,
+                            skip_unchanged: bool = True,
+                            on_news_error: Optional[Callable[[], None]] = None,
+                            on_papers_error: Optional[Callable[[], None]] = None
+                            ) -> Tuple[List[NewsItem], List[PaperItem]]:
+    """
+    Collects news and papers concurrently over one pooled HTTP session.
+
+    `news_since` / `papers_since` restrict each source to items newer than its
+    stored high-water mark (see database.get_cursor).
+
+    The `on_*_page` callbacks receive each page of parsed items as it arrives,
+    which lets downstream stages start before collection finishes. Pages that
+    are unchanged since the last run (HTTP cache hit, 304 or identical body)
+    are skipped when `skip_unchanged` is set. The `on_*_error` callbacks are
+    called for each page that could not be fetched, so callers can hold back
+    that source's cursor.
+
+    Returns:
+        Tuple[List[NewsItem], List[PaperItem]]: (news, papers)
+    """
+    news_queries = news_queries or [DEFAULT_NEWS_QUERY]
+    paper_queries = paper_queries or [DEFAULT_PAPER_QUERY]
+
+    connector = aiohttp.TCPConnector(limit=20, limit_per_host=5)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        news, papers = await asyncio.gather(
+            fetch_news_async(session, news_queries, max_news, base_url=news_url, api_key=api_key,
+                             on_page=on_news_page, since=news_since, skip_unchanged=skip_unchanged,
+                             on_error=on_news_error),
+            fetch_papers_async(session, paper_queries, max_papers, base_url=arxiv_url,
+                               on_page=on_papers_page, since=papers_since, skip_unchanged=skip_unchanged,
+                               on_error=on_papers_error),
+        )
+    return news, papers
+
+def collect_all(**kwargs) -> Tuple[List[NewsItem], List[PaperItem]]:
+    """
+    Synchronous entry point for collect_all_async (see its arguments).
+    """
+    return asyncio.run(collect_all_async(**kwargs))
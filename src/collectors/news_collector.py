@@ -1,9 +1,12 @@
-import requests
+import json
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 import yaml
 
+from src.pipeline.records import NewsItem, news_from_api
+from src.storage import http_cache
+
 # Load API key from config file
 def load_api_key():
     try:
@@ -33,46 +36,54 @@ def load_api_key():
 # def load_api_key():
 #     return st.secrets["news_api_key"]
 
-def fetch_latest_news(query: str = "artificial intelligence OR AI OR ML OR machine learning OR Large Language Models OR Generative AI OR Data Science OR Agentic AI OR MCP", max_results: int = 10) -> List[Dict]:
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+DEFAULT_NEWS_QUERY = "artificial intelligence OR AI OR ML OR machine learning OR Large Language Models OR Generative AI OR Data Science OR Agentic AI OR MCP"
+REQUEST_TIMEOUT = 15  # seconds
+
+def build_news_params(query: str, page_size: int, api_key: str, page: int = 1,
+                      since: Optional[str] = None) -> Dict:
+    """
+    Builds NewsAPI /everything query parameters for the last two days, or
+    from `since` (ISO 8601 timestamp of the newest article already seen).
+    """
+    return {
+        "q": query,
+        "language": "en",
+        "sortBy": "publishedAt",  # or 'relevancy', 'popularity'
+        "pageSize": page_size,
+        "page": page,
+        "from": since or (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d'),
+        "to": datetime.now().strftime('%Y-%m-%d'),
+        "apiKey": api_key
+    }
+
+def parse_news_articles(articles: List[Dict]) -> List[NewsItem]:
+    """
+    Converts raw NewsAPI articles into the pipeline's news records.
+    """
+    return [news_from_api(a) for a in articles]
+
+def fetch_latest_news(query: str = DEFAULT_NEWS_QUERY, max_results: int = 10,
+                      since: Optional[str] = None) -> List[NewsItem]:
     """
     Fetches the latest news articles using NewsAPI.
 
     Args:
         query (str): The keyword(s) to search for.
         max_results (int): Number of articles to retrieve.
+        since (Optional[str]): Only fetch articles published at or after this ISO timestamp.
 
     Returns:
-        List[Dict]: A list of article dictionaries.
+        List[NewsItem]: The articles as news records.
     """
-    api_key = load_api_key()
-    url = "https://newsapi.org/v2/everything"
-
-    params = {
-        "q": query,
-        "language": "en",
-        "sortBy": "publishedAt",  # or 'relevancy', 'popularity'
-        "pageSize": max_results,
-        "from": (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d'),
-        "to": datetime.now().strftime('%Y-%m-%d'),
-        "apiKey": api_key
-    }
+    params = build_news_params(query, max_results, load_api_key(), since=since)
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        articles = response.json().get("articles", [])
+        body, _ = http_cache.get(NEWS_API_URL, params=params, ttl_seconds=http_cache.SOURCE_TTLS["newsapi"],
+                                 timeout=REQUEST_TIMEOUT, source="newsapi")
+        articles = json.loads(body).get("articles", [])
         logging.info(f"Fetched {len(articles)} news articles.")
-        return [
-            {
-                "title": a["title"],
-                "url": a["url"],
-                "source": a["source"]["name"],
-                "published_at": a["publishedAt"],
-                "description": a["description"],
-                "content": a.get("content") or a.get("description"),
-            }
-            for a in articles
-        ]
+        return parse_news_articles(articles)
     except Exception as e:
         logging.error(f"Failed to fetch news: {e}")
         return []
@@ -1,40 +1,66 @@
 import feedparser
 import logging
-from typing import List, Dict
+from datetime import datetime
+from typing import List, Optional
+
+from src.pipeline.records import PaperItem, paper_from_entry
+from src.storage import http_cache
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+DEFAULT_PAPER_QUERY = "all:(generative AI OR large language models OR LLM OR foundation models OR multimodal OR diffusion OR image-to-text OR vision-language OR multi-modal)"
+REQUEST_TIMEOUT = 30  # seconds
+
+def build_arxiv_url(query: str, max_results: int, start: int = 0, base_url: str = ARXIV_API_URL,
+                    since: Optional[str] = None) -> str:
+    """
+    Builds an arXiv API query URL, newest first. With `since` (ISO 8601 timestamp
+    of the newest paper already seen) the query is limited to later submissions;
+    an unparseable `since` is logged and ignored, so the full query is fetched.
+    """
+    if since:
+        try:
+            since_stamp = datetime.strptime(since[:16], "%Y-%m-%dT%H:%M").strftime("%Y%m%d%H%M")
+            query = f"({query}) AND submittedDate:[{since_stamp} TO 999912312359]"
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Ignoring invalid arXiv cursor {since!r}, fetching without it: {e}")
+    return (f"{base_url}?search_query={query}&sortBy=submittedDate&sortOrder=descending"
+            f"&start={start}&max_results={max_results}")
+
+def parse_arxiv_feed(raw: bytes) -> List[PaperItem]:
+    """
+    Parses raw arXiv Atom bytes into the pipeline's paper records.
+
+    Args:
+        raw (bytes): Atom response body (feedparser does no network I/O here).
+
+    Returns:
+        List[PaperItem]: Parsed papers.
+    """
+    feed = feedparser.parse(raw)
+    return [paper_from_entry(entry) for entry in feed.entries]
 
 def fetch_latest_papers(
-        query: str = "all:(generative AI OR large language models OR LLM OR foundation models OR multimodal OR diffusion OR image-to-text OR vision-language OR multi-modal)",
-        max_results: int = 10
-) -> List[Dict]:
+        query: str = DEFAULT_PAPER_QUERY,
+        max_results: int = 10,
+        since: Optional[str] = None
+) -> List[PaperItem]:
     """
     Fetches the latest AI/ML papers from arXiv using the arXiv RSS/Atom API.
 
     Args:
         query (str): Search query in arXiv format (default: machine learning categories).
         max_results (int): Number of papers to fetch.
+        since (Optional[str]): Only fetch papers submitted at or after this ISO timestamp.
 
     Returns:
-        List[Dict]: List of parsed paper metadata.
+        List[PaperItem]: Parsed papers.
     """
-    base_url = "http://export.arxiv.org/api/query?"
-    url = f"{base_url}search_query={query}&sortBy=submittedDate&sortOrder=descending&max_results={max_results}"
+    url = build_arxiv_url(query, max_results, since=since)
 
     try:
-        feed = feedparser.parse(url)
-        entries = feed.entries
-        papers = []
-
-        for entry in entries:
-            paper = {
-                "title": entry.title,
-                "authors": [author.name for author in entry.authors],
-                "summary": entry.summary,
-                "published": entry.published,
-                "link": entry.link,
-                "arxiv_id": entry.id.split('/')[-1],
-                "categories": entry.tags if "tags" in entry else [],
-            }
-            papers.append(paper)
+        body, _ = http_cache.get(url, ttl_seconds=http_cache.SOURCE_TTLS["arxiv"], timeout=REQUEST_TIMEOUT,
+                                  source="arxiv")
+        papers = parse_arxiv_feed(body)
 
         logging.info(f"Fetched {len(papers)} papers from arXiv.")
         return papers
@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import random
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+# Seconds between runs, +/- DAEMON_JITTER of it so many instances don't hit the APIs in lockstep
+DAEMON_INTERVAL = float(os.environ.get("DAEMON_INTERVAL", 3600))
+DAEMON_JITTER = float(os.environ.get("DAEMON_JITTER", 0.1))
+# Health/trigger endpoint, bound to localhost only
+DAEMON_HOST = os.environ.get("DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.environ.get("DAEMON_PORT", 8765))
+
+def next_delay(interval: float, jitter: float) -> float:
+    return max(0.0, interval * (1 + random.uniform(-jitter, jitter)))
+
+class PipelineDaemon:
+    """
+    Runs the pipeline on a schedule inside one long-lived process.
+
+    Models, the SQLite connection and the inference pool are loaded once and
+    reused by every run. Runs are incremental, so each one only processes items
+    newer than the stored cursors. A run can also be triggered early over HTTP.
+    """
+
+    def __init__(self, run: Callable[[], str], interval: float = DAEMON_INTERVAL, jitter: float = DAEMON_JITTER,
+                 host: str = DAEMON_HOST, port: int = DAEMON_PORT):
+        self.run = run
+        self.interval = interval
+        self.jitter = jitter
+        self.stopping = threading.Event()
+        self.wake = threading.Event()
+        self.running = threading.Lock()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.state: Dict[str, object] = {"runs": 0, "last_status": None, "last_started": None,
+                                         "last_finished": None, "next_run": None}
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    def _handler(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, code: int, body: Dict):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._reply(200, daemon.health())
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != "/trigger":
+                    self._reply(404, {"error": "not found"})
+                elif daemon.stopping.is_set():
+                    self._reply(503, {"error": "shutting down"})
+                else:
+                    daemon.wake.set()
+                    self._reply(202, {"triggered": True, "already_running": daemon.running.locked()})
+
+            def log_message(self, format, *args):
+                logging.debug(f"Daemon endpoint: {format % args}")
+
+        return Handler
+
+    def health(self) -> Dict:
+        return {"status": "stopping" if self.stopping.is_set() else "ok", "running": self.running.locked(),
+                "started_at": self.started_at, **self.state}
+
+    def tick(self):
+        with self.running:
+            self.state["last_started"] = datetime.now(timezone.utc).isoformat()
+            try:
+                status = self.run()
+            except Exception as e:
+                logging.exception(f"Scheduled run failed: {e}")
+                status = "failed"
+            self.state["runs"] += 1
+            self.state["last_status"] = status
+            self.state["last_finished"] = datetime.now(timezone.utc).isoformat()
+
+    def stop(self, *_):
+        """
+        Requests a graceful shutdown: the current run finishes (its queues drain
+        and results are stored), then the loop exits. A second signal kills the process.
+        """
+        logging.info("Shutdown requested; finishing the current run.")
+        self.stopping.set()
+        self.wake.set()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, signal.SIG_DFL)
+
+    def serve_forever(self, run_immediately: bool = True):
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+        threading.Thread(target=self.server.serve_forever, name="daemon-http", daemon=True).start()
+        host, port = self.server.server_address[:2]
+        logging.info(f"Daemon listening on http://{host}:{port} (GET /health, POST /trigger), "
+                     f"interval {self.interval:.0f}s +/- {self.jitter:.0%}.")
+
+        delay = 0.0 if run_immediately else next_delay(self.interval, self.jitter)
+        try:
+            while not self.stopping.is_set():
+                self.state["next_run"] = datetime.fromtimestamp(time.time() + delay, timezone.utc).isoformat()
+                self.wake.wait(delay)
+                self.wake.clear()
+                if self.stopping.is_set():
+                    break
+                self.tick()
+                delay = next_delay(self.interval, self.jitter)
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+            logging.info(f"Daemon stopped after {self.state['runs']} runs.")
+
+def run_daemon(run: Callable[[], str], interval: Optional[float] = None, jitter: Optional[float] = None,
+               port: Optional[int] = None):
+    """
+    Warms all models, then runs `run` every `interval` seconds until SIGTERM/SIGINT.
+
+    Args:
+        run (Callable[[], str]): One pipeline run; returns its status ("ok"/"failed").
+        interval (float): Seconds between runs (default: DAEMON_INTERVAL).
+        jitter (float): Random spread as a fraction of the interval (default: DAEMON_JITTER).
+        port (int): Port of the local health/trigger endpoint (default: DAEMON_PORT).
+    """
+    from src.processors.model_registry import warm_models
+    from src.processors.parallel import shutdown_pool
+    from src.storage import cache
+
+    daemon = PipelineDaemon(run, interval=interval or DAEMON_INTERVAL,
+                            jitter=DAEMON_JITTER if jitter is None else jitter, port=port or DAEMON_PORT)
+    # Load once, in the foreground: every run after this starts with warm models
+    warm_models(background=False)
+    try:
+        daemon.serve_forever()
+    finally:
+        shutdown_pool()
+        cache.close()
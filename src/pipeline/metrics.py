@@ -0,0 +1,195 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from src.storage import cache
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Structured run reports, one JSON object per line
+RUN_REPORT_PATH = os.environ.get("RUN_REPORT_PATH", "logs/run_report.jsonl")
+# Optional node_exporter textfile-collector output (unset = disabled)
+PROMETHEUS_TEXTFILE = os.environ.get("PROMETHEUS_TEXTFILE")
+
+STAGE_FIELDS = ("wall_time", "calls", "items_in", "items_out", "tokens")
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process and its finished children, in MB.
+    """
+    if resource is None:
+        return 0.0
+    # ru_maxrss is in KB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / 1024, 1)
+
+class RunMetrics:
+    """
+    Per-stage counters for one pipeline run. Stages run in different threads,
+    so every update goes through one lock.
+    """
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.start = time.perf_counter()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.lock = threading.Lock()
+        self.cache_before = dict(cache.get_stats())
+
+    def record(self, stage: str, wall_time: float = 0.0, calls: int = 0, items_in: int = 0,
+               items_out: int = 0, tokens: int = 0):
+        with self.lock:
+            stats = self.stages.setdefault(stage, dict.fromkeys(STAGE_FIELDS, 0))
+            stats["wall_time"] += wall_time
+            stats["calls"] += calls
+            stats["items_in"] += items_in
+            stats["items_out"] += items_out
+            stats["tokens"] += tokens
+
+    def report(self, status: str = "ok") -> Dict:
+        """
+        Builds the run report: totals, per-stage throughput, cache hits and peak RSS.
+        """
+        cache_stats = cache.get_stats()
+        cache_delta = {key: value - self.cache_before.get(key, 0) for key, value in cache_stats.items()
+                       if value - self.cache_before.get(key, 0)}
+        with self.lock:
+            stages = {}
+            for name, stats in self.stages.items():
+                stage = dict(stats)
+                stage["wall_time"] = round(stage["wall_time"], 3)
+                stage["items_per_sec"] = round(stats["items_in"] / stats["wall_time"], 2) if stats["wall_time"] else 0.0
+                stages[name] = stage
+
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "status": status,
+            "duration": round(time.perf_counter() - self.start, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "cache": cache_delta,
+            "stages": stages,
+        }
+
+_current: Optional[RunMetrics] = None
+
+def start_run(run_id: Optional[str] = None) -> RunMetrics:
+    global _current
+    _current = RunMetrics(run_id)
+    return _current
+
+def current_run() -> Optional[RunMetrics]:
+    return _current
+
+@contextmanager
+def stage(name: str, items_in: int = 0):
+    """
+    Times a block as one call of stage `name`. Set `counts["items_out"]` (and
+    optionally `counts["tokens"]`) inside the block.
+
+    Does nothing when no run is active (e.g. in inference worker processes).
+    """
+    counts = {"items_out": 0, "tokens": 0}
+    started = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        run = _current
+        if run is not None:
+            run.record(name, wall_time=time.perf_counter() - started, calls=1, items_in=items_in,
+                       items_out=counts["items_out"], tokens=counts["tokens"])
+
+def add_tokens(name: str, tokens: int):
+    run = _current
+    if run is not None:
+        run.record(name, tokens=tokens)
+
+def write_report(report: Dict, path: Optional[str] = None):
+    """
+    Appends the run report as one JSON line.
+    """
+    path = path or RUN_REPORT_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+def format_prometheus(report: Dict) -> str:
+    """
+    Renders a run report in the Prometheus text exposition format.
+    """
+    lines = [
+        "# HELP pipeline_run_duration_seconds Wall time of the last pipeline run.",
+        "# TYPE pipeline_run_duration_seconds gauge",
+        f"pipeline_run_duration_seconds {report['duration']}",
+        "# HELP pipeline_run_success Whether the last pipeline run succeeded.",
+        "# TYPE pipeline_run_success gauge",
+        f"pipeline_run_success {int(report['status'] == 'ok')}",
+        "# HELP pipeline_peak_rss_megabytes Peak resident memory of the last run.",
+        "# TYPE pipeline_peak_rss_megabytes gauge",
+        f"pipeline_peak_rss_megabytes {report['peak_rss_mb']}",
+        "# HELP pipeline_last_run_timestamp_seconds When the last run finished.",
+        "# TYPE pipeline_last_run_timestamp_seconds gauge",
+        f"pipeline_last_run_timestamp_seconds {time.time():.0f}",
+    ]
+    for field in STAGE_FIELDS + ("items_per_sec",):
+        metric = f"pipeline_stage_{field}"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(f'{metric}{{stage="{name}"}} {stats[field]}' for name, stats in report["stages"].items())
+    lines.append("# TYPE pipeline_cache_events gauge")
+    lines.extend(f'pipeline_cache_events{{event="{key}"}} {value}' for key, value in report["cache"].items())
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(report: Dict, path: Optional[str] = None):
+    """
+    Writes the report for node_exporter's textfile collector (atomically, via rename).
+    """
+    path = path or PROMETHEUS_TEXTFILE
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(format_prometheus(report))
+    os.replace(tmp_path, path)
+
+def finish_run(status: str = "ok") -> Optional[Dict]:
+    """
+    Closes the active run and writes its JSONL report, Prometheus textfile and
+    `runs` row. Output failures are logged, never raised.
+
+    Returns:
+        Optional[Dict]: The run report, or None if no run was active.
+    """
+    global _current
+    run, _current = _current, None
+    if run is None:
+        return None
+
+    report = run.report(status)
+    for writer in (write_report, write_prometheus):
+        try:
+            writer(report)
+        except OSError as e:
+            logging.warning(f"Could not write run report with {writer.__name__}: {e}")
+    try:
+        from src.storage.database import save_run
+        save_run(report)
+    except Exception as e:
+        logging.warning(f"Could not store run report: {e}")
+
+    summary = ", ".join(f"{name} {stats['wall_time']:.1f}s" for name, stats in report["stages"].items())
+    logging.info(f"Run {report['run_id']} {status} in {report['duration']:.1f}s "
+                 f"(peak RSS {report['peak_rss_mb']} MB): {summary}")
+    return report
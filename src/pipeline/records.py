@@ -0,0 +1,98 @@
+from dataclasses import asdict, dataclass, field
+from typing import ClassVar, Dict, List, Optional
+
+@dataclass(slots=True)
+class Item:
+    """
+    One collected article or paper as it moves through the pipeline.
+
+    News and papers share one normalized schema: `url` is the canonical link,
+    `published` the ISO 8601 publication time and `content` the cleaned body
+    (article text or abstract). Stages fill in `summary`, `diagram`,
+    `relevance_score` and `score`. `__slots__` keeps per-item memory small on
+    large runs.
+    """
+    kind: ClassVar[str] = ""
+
+    title: str
+    url: str
+    published: str
+    content: str = ""
+    source: str = ""
+    summary: str = ""
+    diagram: str = ""
+    relevance_score: float = 0.5  # neutral until scored
+    score: float = 0.0
+    minhash: Optional[object] = field(default=None, repr=False, compare=False)  # numpy uint32 signature
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data.pop("minhash")
+        return data
+
+@dataclass(slots=True)
+class NewsItem(Item):
+    kind: ClassVar[str] = "news"
+
+    description: str = ""
+
+@dataclass(slots=True)
+class PaperItem(Item):
+    kind: ClassVar[str] = "papers"
+
+    arxiv_id: str = ""
+    authors: List[str] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+    insights: Dict[str, str] = field(default_factory=dict)
+
+RECORD_TYPES = {"news": NewsItem, "papers": PaperItem}
+
+def news_from_api(article: Dict) -> NewsItem:
+    """
+    Converts one raw NewsAPI article into a NewsItem.
+    """
+    description = article.get("description") or ""
+    return NewsItem(
+        title=article.get("title") or "",
+        url=article.get("url") or "",
+        published=article.get("publishedAt") or "",
+        content=article.get("content") or description,
+        source=(article.get("source") or {}).get("name") or "",
+        description=description,
+    )
+
+def paper_from_entry(entry) -> PaperItem:
+    """
+    Converts one feedparser arXiv entry into a PaperItem (abstract -> content).
+    """
+    return PaperItem(
+        title=entry.title,
+        url=entry.link,
+        published=entry.published,
+        content=entry.summary,
+        source="arxiv",
+        arxiv_id=entry.id.split("/")[-1],
+        authors=[author.name for author in entry.get("authors", [])],
+        categories=[tag.term for tag in entry.get("tags", []) if tag.get("term")],
+    )
+
+def from_dict(content_type: str, data: Dict) -> Item:
+    """
+    Builds a record from a legacy item dict ('link'/'published_at'/'summary' keys accepted).
+
+    Args:
+        content_type (str): 'news' or 'papers'.
+        data (Dict): Item fields.
+
+    Returns:
+        Item: NewsItem or PaperItem.
+    """
+    record_type = RECORD_TYPES[content_type]
+    fields = {name: data[name] for name in record_type.__dataclass_fields__ if name in data}
+    fields.setdefault("url", data.get("link", ""))
+    fields.setdefault("published", data.get("published_at", ""))
+    fields.setdefault("content", data.get("summary") or data.get("description") or "")
+    fields.setdefault("title", "")
+    if content_type == "papers":
+        fields.setdefault("source", "arxiv")
+    return record_type(**fields)
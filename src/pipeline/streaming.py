@@ -0,0 +1,272 @@
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.collectors.async_collector import collect_all
+from src.pipeline import metrics
+from src.pipeline.records import Item
+from src.processors.cleaner import clean_and_deduplicate
+from src.processors.diagram_generator import generate_mermaid_diagrams
+from src.processors.summarizer import summarize_content, extract_insights_batch
+from src.ranking.ranker import StreamingTopK
+from src.ranking.relevance import score_relevance
+from src.storage import http_cache
+from src.storage.vector_store import index_items
+from src.processors.minhash import MinHashLSH, minhash_signatures
+from src.storage.database import (
+    save_to_db, get_cursor, update_cursor, filter_new_items, load_signatures, save_signatures
+)
+
+# Maximum number of chunks waiting between two stages (backpressure)
+QUEUE_SIZE = 4
+
+# Jaccard similarity above which two items count as the same story (None disables)
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+_END = object()  # end-of-stream marker
+
+Chunk = Tuple[str, List[Item]]  # (content_type, items) with content_type 'news' or 'papers'
+
+# Cursor source name and id field for each content type
+CURSOR_SOURCES = {"news": ("newsapi", "url"), "papers": ("arxiv", "arxiv_id")}
+
+def advance_high_water(high_water: Dict[str, Tuple[str, str]], content_type: str, items: List[Item]):
+    """
+    Raises the (published, id) mark of `content_type` to the newest of `items`.
+    """
+    id_field = CURSOR_SOURCES[content_type][1]
+    for item in items:
+        if item.published > high_water.get(content_type, ("", ""))[0]:
+            high_water[content_type] = (item.published, getattr(item, id_field))
+
+def _run_stage(name: str, fn: Callable[[Chunk], Optional[Chunk]], inbox: queue.Queue, outbox: queue.Queue,
+               failed: Optional[Set[str]] = None):
+    """
+    Applies `fn` to every chunk from `inbox` and forwards non-empty results to `outbox`.
+    A failing chunk is logged and dropped so one bad batch does not stop the run;
+    its content type is added to `failed`.
+    """
+    try:
+        while True:
+            chunk = inbox.get()
+            if chunk is _END:
+                break
+            try:
+                result = fn(chunk)
+            except Exception as e:
+                logging.exception(f"Stage '{name}' failed on a {chunk[0]} chunk: {e}")
+                if failed is not None:
+                    failed.add(chunk[0])
+                continue
+            if result and result[1]:
+                outbox.put(result)
+    finally:
+        outbox.put(_END)
+
+def forget_fetched_pages(content_types: Set[str], since: float):
+    """
+    Drops the HTTP cache entries the given content types' sources fetched since
+    `since`. Their pages were cached as seen, but some of their items were never
+    stored; without this the next run would skip those pages as unchanged.
+    """
+    for content_type in sorted(content_types):
+        http_cache.forget_since(since, CURSOR_SOURCES[content_type][0])
+
+def make_cleaner(skip_known: bool, near_duplicate_threshold: Optional[float]) -> Callable[[Chunk], Chunk]:
+    """
+    Returns the clean stage: drops items already stored (with `skip_known`) and
+    exact or near duplicates of items seen earlier in this run or stored before.
+    """
+    seen = {"news": set(), "papers": set()}
+    indexes = {}
+    if near_duplicate_threshold is not None:
+        for content_type in seen:
+            indexes[content_type] = MinHashLSH(near_duplicate_threshold)
+            if skip_known:
+                load_signatures(content_type, indexes[content_type])
+
+    def clean(chunk: Chunk) -> Chunk:
+        content_type, items = chunk
+        with metrics.stage("clean", items_in=len(items)) as counts:
+            if skip_known:
+                items = filter_new_items(content_type, items)
+            items = clean_and_deduplicate(items, seen_hashes=seen[content_type],
+                                          near_duplicate_threshold=near_duplicate_threshold,
+                                          lsh_index=indexes.get(content_type))
+            counts["items_out"] = len(items)
+        return content_type, items
+    return clean
+
+def save_item_signatures(content_type: str, items: List[Item]):
+    """
+    Persists MinHash signatures of stored items, so later runs can drop their
+    syndicated copies. Only stored items are saved: an item that was cleaned but
+    not stored must still be processed when it is collected again.
+    """
+    missing = [item for item in items if item.minhash is None]
+    for item, signature in zip(missing, minhash_signatures([f"{item.title} {item.content}" for item in missing])):
+        item.minhash = signature
+    save_signatures(content_type, {item.url: item.minhash for item in items if item.url})
+    for item in items:
+        item.minhash = None
+
+def summarize_chunk(chunk: Chunk) -> Chunk:
+    """
+    Summarizes one (content_type, items) chunk.
+    """
+    content_type, items = chunk
+    with metrics.stage("summarize", items_in=len(items)) as counts:
+        items = summarize_content(items, content_type="news" if content_type == "news" else "paper")
+        counts["items_out"] = len(items)
+    return content_type, items
+
+def enrich_chunk(chunk: Chunk) -> Chunk:
+    """
+    Adds diagrams and insights (papers only) and relevance scores to a summarized chunk.
+    """
+    content_type, items = chunk
+    if content_type == "papers":
+        with metrics.stage("diagrams", items_in=len(items)) as counts:
+            generate_mermaid_diagrams(items)
+            counts["items_out"] = sum(1 for paper in items if paper.diagram)
+        with metrics.stage("insights", items_in=len(items)) as counts:
+            insights = extract_insights_batch([paper.summary for paper in items])
+            for paper, paper_insights in zip(items, insights):
+                paper.insights = paper_insights
+            counts["items_out"] = sum(1 for paper_insights in insights if paper_insights)
+    with metrics.stage("relevance", items_in=len(items)) as counts:
+        score_relevance(items)
+        counts["items_out"] = len(items)
+    return chunk
+
+def run_streaming_pipeline(top_k: int = 5, collect: Callable[..., object] = collect_all,
+                           store: Callable[[str, List[Item]], Optional[bool]] = save_to_db,
+                           incremental: bool = True,
+                           near_duplicate_threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD,
+                           index_vectors: bool = True, **collect_kwargs) -> Dict[str, List[Item]]:
+    """
+    Runs collect -> clean -> summarize -> enrich -> rank as concurrent stages.
+
+    Each stage runs in its own thread and hands chunks (one page of results) to
+    the next through a bounded queue, so network I/O overlaps with inference and
+    a slow stage throttles the ones before it. Ranking keeps only the running
+    top K per content type, so memory does not grow with the number of items.
+
+    In incremental mode each source is only asked for items newer than its
+    stored cursor, items already in the database are dropped before they reach
+    the summarizer, and the cursors are advanced once results are stored. A
+    cursor only moves past items that made it through enrichment, and not at all
+    if a page of that source could not be fetched, a chunk of it failed in any
+    stage or its store failed, so those items are fetched again next run.
+
+    Pages the collector reports as unchanged since the last run (HTTP cache) are
+    never emitted; if no page changed, nothing is stored and the result is empty.
+    If a source's items failed in a stage or could not be stored, the pages it
+    fetched in this run are dropped from the HTTP cache so they are emitted again.
+
+    Args:
+        top_k (int): Number of items per content type to keep and store.
+        collect (Callable): Collector accepting `on_news_page`/`on_papers_page` callbacks.
+        store (Callable): Called once per content type with the final top K items.
+        incremental (bool): Use and advance the per-source high-water marks.
+        near_duplicate_threshold (Optional[float]): MinHash/LSH Jaccard threshold for
+            dropping syndicated copies (checked against earlier runs in incremental mode).
+        index_vectors (bool): Append stored items to the semantic search index.
+        **collect_kwargs: Extra arguments for `collect`.
+
+    Returns:
+        Dict[str, List[Item]]: Stored top K items for 'news' and 'papers'.
+    """
+    started = time.time()
+    to_clean, to_summarize, to_enrich, to_rank = (queue.Queue(maxsize=QUEUE_SIZE) for _ in range(4))
+    high_water: Dict[str, Tuple[str, str]] = {}
+    failed: Set[str] = set()
+    emitted = {"news": 0, "papers": 0}
+
+    def emit(content_type: str, items: List[Item]):
+        emitted[content_type] += 1
+        to_clean.put((content_type, items))
+
+    if incremental:
+        for content_type, (source, _) in CURSOR_SOURCES.items():
+            cursor = get_cursor(source)
+            if cursor:
+                collect_kwargs.setdefault(f"{content_type}_since", cursor["last_published"])
+
+    def producer():
+        try:
+            # put() blocks when the cleaner is behind, which pauses delivery of further pages
+            # (the collector calls back from worker threads, so its event loop keeps running)
+            collect(on_news_page=lambda items: emit("news", items),
+                    on_papers_page=lambda items: emit("papers", items),
+                    on_news_error=lambda: failed.add("news"),
+                    on_papers_error=lambda: failed.add("papers"),
+                    **collect_kwargs)
+        except Exception as e:
+            failed.update(CURSOR_SOURCES)  # some pages may never have been fetched
+            logging.exception(f"Collection failed: {e}")
+        finally:
+            to_clean.put(_END)
+
+    threads = [
+        threading.Thread(target=producer, name="collect", daemon=True),
+        threading.Thread(target=_run_stage,
+                         args=("clean", make_cleaner(incremental, near_duplicate_threshold),
+                               to_clean, to_summarize, failed),
+                         name="clean", daemon=True),
+        threading.Thread(target=_run_stage, args=("summarize", summarize_chunk, to_summarize, to_enrich, failed),
+                         name="summarize", daemon=True),
+        threading.Thread(target=_run_stage, args=("enrich", enrich_chunk, to_enrich, to_rank, failed),
+                         name="enrich", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    rankers = {"news": StreamingTopK(top_k), "papers": StreamingTopK(top_k)}
+    while True:
+        chunk = to_rank.get()
+        if chunk is _END:
+            break
+        content_type, items = chunk
+        with metrics.stage("rank", items_in=len(items)):
+            rankers[content_type].push(items)
+        advance_high_water(high_water, content_type, items)
+
+    for thread in threads:
+        thread.join()
+
+    if not any(emitted.values()):
+        logging.info("No source returned new or changed pages; skipping storage and indexing.")
+        return {content_type: [] for content_type in rankers}
+
+    results = {content_type: ranker.result() for content_type, ranker in rankers.items()}
+    unstored = set(failed)
+    for content_type, items in results.items():
+        with metrics.stage("store", items_in=len(items)) as counts:
+            stored = store(content_type, items) is not False
+            counts["items_out"] = len(items) if stored else 0
+        if not stored:
+            unstored.add(content_type)
+            continue
+        if incremental and near_duplicate_threshold is not None:
+            save_item_signatures(content_type, items)
+        if index_vectors:
+            with metrics.stage("index", items_in=len(items)):
+                try:
+                    index_items(content_type, items)
+                except Exception as e:
+                    logging.warning(f"Vector indexing of {content_type} failed: {e}")
+
+    if unstored:
+        forget_fetched_pages(unstored, started)
+
+    if incremental:
+        for content_type, (published, last_id) in high_water.items():
+            if content_type in unstored:
+                logging.warning(f"Not advancing the {content_type} cursor: some of its items were not "
+                                f"fetched, processed or stored.")
+                continue
+            update_cursor(CURSOR_SOURCES[content_type][0], published, last_id)
+    return results
@@ -0,0 +1,261 @@
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from src.collectors.async_collector import collect_all
+from src.pipeline import metrics
+from src.pipeline.records import Item
+from src.pipeline.streaming import (
+    CURSOR_SOURCES, NEAR_DUPLICATE_THRESHOLD, advance_high_water, enrich_chunk, forget_fetched_pages, make_cleaner,
+    save_item_signatures, summarize_chunk
+)
+from src.ranking.ranker import StreamingTopK
+from src.storage.database import (
+    WORK_LEASE_SECONDS, claim_batch, complete_jobs, enqueue_items, extend_leases, fail_jobs, fetch_completed,
+    get_cursor, mark_ranked, queue_counts, release_leases, requeue_expired, save_to_db, update_cursor
+)
+from src.storage.vector_store import index_items
+
+# Items a worker leases at a time; small batches spread load evenly across workers
+WORK_BATCH_SIZE = int(os.environ.get("WORK_BATCH_SIZE", 16))
+
+# Seconds the coordinator keeps waiting while no worker holds a lease and the queue does not move
+COORDINATOR_IDLE_TIMEOUT = float(os.environ.get("COORDINATOR_IDLE_TIMEOUT", 120))
+
+def default_worker_id(pid: Optional[int] = None) -> str:
+    return f"{socket.gethostname()}:{pid or os.getpid()}"
+
+def enqueue_collected(collect: Callable[..., object] = collect_all, incremental: bool = True,
+                      near_duplicate_threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD,
+                      **collect_kwargs) -> int:
+    """
+    Collects, cleans and deduplicates new items and adds them to the work queue
+    instead of processing them in this process.
+
+    Cursors advance once the items are queued: from then on they are durable in
+    the database, and any worker can pick them up. If a page of a source could
+    not be fetched or queued, that source's cursor stays put, and the pages it
+    fetched in this call are dropped from the HTTP cache so the next call emits
+    them again.
+
+    Returns:
+        int: Number of items newly queued.
+    """
+    started = time.time()
+    high_water: Dict = {}
+    failed: Set[str] = set()
+    clean = make_cleaner(incremental, near_duplicate_threshold)
+    queued = 0
+
+    if incremental:
+        for content_type, (source, _) in CURSOR_SOURCES.items():
+            cursor = get_cursor(source)
+            if cursor:
+                collect_kwargs.setdefault(f"{content_type}_since", cursor["last_published"])
+
+    def enqueue(content_type: str, items: List[Item]):
+        nonlocal queued
+        try:
+            content_type, items = clean((content_type, items))
+            queued += enqueue_items(content_type, items)
+            advance_high_water(high_water, content_type, items)
+        except Exception as e:
+            failed.add(content_type)
+            logging.exception(f"Failed to queue a {content_type} page: {e}")
+
+    try:
+        collect(on_news_page=lambda items: enqueue("news", items),
+                on_papers_page=lambda items: enqueue("papers", items),
+                on_news_error=lambda: failed.add("news"),
+                on_papers_error=lambda: failed.add("papers"),
+                **collect_kwargs)
+    except Exception as e:
+        failed.update(CURSOR_SOURCES)
+        logging.exception(f"Collection failed: {e}")
+
+    if failed:
+        forget_fetched_pages(failed, started)
+
+    if incremental:
+        for content_type, (published, last_id) in high_water.items():
+            if content_type in failed:
+                logging.warning(f"Not advancing the {content_type} cursor: some of its pages were not "
+                                f"fetched or queued.")
+                continue
+            update_cursor(CURSOR_SOURCES[content_type][0], published, last_id)
+    return queued
+
+def process_jobs(worker_id: str, jobs: List, lease_seconds: float = WORK_LEASE_SECONDS) -> int:
+    """
+    Summarizes and enriches one leased batch (diagrams and insights for papers,
+    relevance for both) and commits the results.
+
+    Returns:
+        int: Number of jobs completed.
+    """
+    completed = 0
+    for content_type in ("news", "papers"):
+        batch = [(job_id, item) for job_id, item in jobs if item.kind == content_type]
+        if not batch:
+            continue
+        job_ids = [job_id for job_id, _ in batch]
+        items = [item for _, item in batch]
+        try:
+            chunk = summarize_chunk((content_type, items))
+            extend_leases(worker_id, job_ids, lease_seconds)
+            _, items = enrich_chunk(chunk)
+            completed += complete_jobs(worker_id, dict(zip(job_ids, items)))
+        except Exception as e:
+            logging.exception(f"Worker {worker_id} failed on {len(batch)} {content_type} items: {e}")
+            fail_jobs(worker_id, job_ids, str(e))
+    return completed
+
+def run_worker(worker_id: Optional[str] = None, batch_size: int = WORK_BATCH_SIZE,
+               lease_seconds: float = WORK_LEASE_SECONDS, exit_when_empty: bool = True,
+               poll_interval: float = 5.0, stop: Optional[threading.Event] = None) -> int:
+    """
+    Claims and processes batches from the work queue until it is empty (or,
+    with `exit_when_empty=False`, until `stop` is set). Any number of workers
+    can run at once, in other processes or on other hosts sharing the database.
+
+    Args:
+        worker_id (Optional[str]): Lease owner name (default: host:pid).
+        batch_size (int): Items leased per claim.
+        lease_seconds (float): Time to finish a batch before it is re-queued.
+        exit_when_empty (bool): Return as soon as there is nothing to claim.
+        poll_interval (float): Seconds to wait for new work when not exiting.
+        stop (Optional[threading.Event]): Set to stop after the current batch.
+
+    Returns:
+        int: Number of jobs this worker completed.
+    """
+    worker_id = worker_id or default_worker_id()
+    stop = stop or threading.Event()
+    completed = 0
+    logging.info(f"Worker {worker_id} started.")
+    while not stop.is_set():
+        jobs = claim_batch(worker_id, batch_size, lease_seconds)
+        if not jobs:
+            if exit_when_empty:
+                break
+            stop.wait(poll_interval)
+            continue
+        completed += process_jobs(worker_id, jobs, lease_seconds)
+    logging.info(f"Worker {worker_id} finished after {completed} items.")
+    return completed
+
+def coordinate(top_k: int = 5, store: Callable[[str, List[Item]], Optional[bool]] = save_to_db,
+               index_vectors: bool = True, wait: bool = True, timeout: Optional[float] = None,
+               poll_interval: float = 5.0,
+               idle_timeout: float = COORDINATOR_IDLE_TIMEOUT) -> Dict[str, List[Item]]:
+    """
+    Ranks all completed, not yet ranked items and stores the top K per content type.
+
+    With `wait`, first waits until no item is pending or leased (expired leases
+    are re-queued meanwhile), so a run's ranking sees every processed item. It
+    stops waiting early if no worker holds a lease and the queue has not moved
+    for `idle_timeout` seconds: pending items then have no worker to run them,
+    and stay queued for the next workers.
+
+    Args:
+        top_k (int): Number of items per content type to store.
+        store (Callable): Called once per content type with the final top K items;
+            returning False leaves the jobs unranked for the next coordinator run.
+        index_vectors (bool): Append stored items to the semantic search index.
+        wait (bool): Wait for outstanding work first.
+        timeout (Optional[float]): Maximum seconds to wait; rank what is done after that.
+        poll_interval (float): Seconds between queue checks while waiting.
+        idle_timeout (float): Seconds to wait while no worker makes progress.
+
+    Returns:
+        Dict[str, List[Item]]: Stored top K items for 'news' and 'papers'.
+    """
+    deadline = time.time() + timeout if timeout is not None else None
+    last_outstanding, idle_since = None, time.time()
+    while wait:
+        requeue_expired()
+        counts = queue_counts()
+        outstanding = counts.get("pending", 0) + counts.get("leased", 0)
+        if not outstanding:
+            break
+        if deadline is not None and time.time() >= deadline:
+            logging.warning(f"Ranking with {outstanding} items still outstanding.")
+            break
+        if counts.get("leased", 0) or outstanding != last_outstanding:
+            last_outstanding, idle_since = outstanding, time.time()
+        elif time.time() - idle_since >= idle_timeout:
+            logging.warning(f"No worker picked up the {outstanding} pending items in {idle_timeout:.0f}s; "
+                            f"ranking what is done.")
+            break
+        time.sleep(poll_interval)
+
+    results = {}
+    for content_type in ("news", "papers"):
+        jobs = fetch_completed(content_type)
+        ranker = StreamingTopK(top_k)
+        with metrics.stage("rank", items_in=len(jobs)):
+            ranker.push([item for _, item in jobs])
+        results[content_type] = ranker.result()
+        if not jobs:
+            continue
+        with metrics.stage("store", items_in=len(results[content_type])) as counts:
+            stored = store(content_type, results[content_type]) is not False
+            counts["items_out"] = len(results[content_type]) if stored else 0
+        if not stored:
+            logging.error(f"Storing ranked {content_type} failed; leaving {len(jobs)} jobs for the next run.")
+            continue
+        save_item_signatures(content_type, results[content_type])
+        if index_vectors:
+            with metrics.stage("index", items_in=len(results[content_type])):
+                try:
+                    index_items(content_type, results[content_type])
+                except Exception as e:
+                    logging.warning(f"Vector indexing of {content_type} failed: {e}")
+        mark_ranked([job_id for job_id, _ in jobs])
+    logging.info(f"Coordinator ranked the work queue; counts now {queue_counts()}.")
+    return results
+
+def _worker_process(db_path: str, log_file: Optional[str], log_level: int):
+    # Spawned processes start with an unconfigured root logger
+    logging.basicConfig(filename=log_file, level=log_level,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    from src.storage import database
+    database.DB_PATH = db_path
+    run_worker()
+
+def _log_file() -> Optional[str]:
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.FileHandler):
+            return handler.baseFilename
+    return None
+
+def run_local(workers: int = 2, top_k: int = 5, **collect_kwargs) -> Dict[str, List[Item]]:
+    """
+    Runs the distributed pipeline on this machine: collect into the queue,
+    process it with `workers` worker processes, then rank.
+
+    Leases held by a worker process that crashed are released as soon as it
+    exits, and whatever it left pending is processed in this process.
+    """
+    from src.storage import database
+
+    enqueue_collected(**collect_kwargs)
+    context = multiprocessing.get_context("spawn")
+    log_args = (_log_file(), logging.getLogger().getEffectiveLevel())
+    processes = [context.Process(target=_worker_process, args=(database.DB_PATH, *log_args), name=f"worker-{i}")
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    crashed = [default_worker_id(process.pid) for process in processes if process.exitcode != 0]
+    if crashed:
+        logging.warning(f"{len(crashed)} worker processes exited abnormally; draining their items here.")
+        release_leases(crashed)
+        run_worker()
+    return coordinate(top_k=top_k)
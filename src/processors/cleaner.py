@@ -1,48 +1,125 @@
 import hashlib
+import html
 import logging
 import re
-from typing import List, Dict
+import unicodedata
+from typing import List, Optional, Set
+
+from src.pipeline.records import Item
+
+# Compiled once at import; clean_text runs on every title and body
+TAG_PATTERN = re.compile(r"<[^>]*>")
+# NewsAPI truncation marker ending the content, e.g. "... [+1234 chars]"
+TRUNCATION_PATTERN = re.compile(r"\s*(?:\u2026|\.\.\.)?\s*\[\+\d+ chars\]\s*$")
+# The marker is only looked for in this many trailing characters
+TRUNCATION_WINDOW = 40
 
 def clean_text(text: str) -> str:
     """
-    Basic text cleaner to remove HTML tags, extra spaces, etc.
+    Normalizes one field for display, hashing and dedup keys.
+
+    Strips HTML tags, unescapes entities (&amp;, &#39;, ...), drops NewsAPI's
+    "[+N chars]" truncation marker, applies NFKC Unicode normalization, collapses
+    whitespace and lowercases. Steps that cannot change the text (no "<", no "&",
+    already normalized) are skipped.
     """
     if not text:
         return ""
-    text = re.sub(r'<.*?>', '', text)             # remove HTML tags
-    text = re.sub(r'\s+', ' ', text).strip()      # normalize whitespace
-    return text.lower()
+    if "<" in text:
+        text = TAG_PATTERN.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    marker = TRUNCATION_PATTERN.search(text, max(0, len(text) - TRUNCATION_WINDOW))
+    if marker:
+        text = text[:marker.start()]
+    if not text.isascii() and not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+    return " ".join(text.split()).lower()
+
+def clean_texts(texts: List[str]) -> List[str]:
+    """
+    Cleans many strings in one call (see clean_text).
 
-def generate_hash(entry: Dict) -> str:
+    A plain top-level function over a list, so it can be handed to a thread or
+    process pool one shard at a time.
+
+    Args:
+        texts (List[str]): Raw strings (None/empty allowed).
+
+    Returns:
+        List[str]: Cleaned strings in the same order.
+    """
+    clean = clean_text
+    return [clean(text) for text in texts]
+
+def generate_hash(entry: Item) -> str:
     """
     Create a hash based on title + content to detect duplicates.
     """
-    base_string = f"{entry.get('title', '')} {entry.get('content', '') or entry.get('summary', '')}"
+    base_string = f"{entry.title} {entry.content}"
     return hashlib.md5(base_string.encode("utf-8")).hexdigest()
 
-def clean_and_deduplicate(entries: List[Dict]) -> List[Dict]:
+def clean_and_deduplicate(entries: List[Item], seen_hashes: Optional[Set[str]] = None,
+                          near_duplicate_threshold: Optional[float] = None,
+                          lsh_index=None) -> List[Item]:
     """
     Cleans and removes duplicate entries from a list of articles or papers.
 
     Args:
-        entries (List[Dict]): Raw list of content items (news or papers).
+        entries (List[Item]): Raw list of content items (news or papers).
+        seen_hashes (Optional[Set[str]]): Hashes already seen; pass the same set
+            across calls to deduplicate a stream of batches. Updated in place.
+        near_duplicate_threshold (Optional[float]): If set, also drop entries whose
+            estimated Jaccard similarity to a kept entry is at least this value
+            (MinHash + LSH, see minhash.py).
+        lsh_index (Optional[MinHashLSH]): Index to check and extend, e.g. one
+            preloaded with signatures of stored items. A fresh one is used if None.
 
     Returns:
-        List[Dict]: Cleaned and deduplicated list.
+        List[Item]: Cleaned and deduplicated list.
     """
-    seen_hashes = set()
+    if seen_hashes is None:
+        seen_hashes = set()
     cleaned_entries = []
 
-    for entry in entries:
-        entry["title"] = clean_text(entry.get("title", ""))
-        entry["content"] = clean_text(entry.get("content", "") or entry.get("summary", ""))
+    titles = clean_texts([entry.title for entry in entries])
+    contents = clean_texts([entry.content for entry in entries])
+
+    for entry, title, content in zip(entries, titles, contents):
+        entry.title = title
+        entry.content = content
         entry_hash = generate_hash(entry)
 
         if entry_hash not in seen_hashes:
             seen_hashes.add(entry_hash)
             cleaned_entries.append(entry)
         else:
-            logging.debug(f"Duplicate removed: {entry['title'][:50]}...")
+            logging.debug(f"Duplicate removed: {entry.title[:50]}...")
+
+    if near_duplicate_threshold is not None or lsh_index is not None:
+        cleaned_entries = remove_near_duplicates(cleaned_entries, near_duplicate_threshold or 0.8, lsh_index)
 
     logging.info(f"{len(cleaned_entries)} items retained after cleaning and deduplication.")
     return cleaned_entries
+
+def remove_near_duplicates(entries: List[Item], threshold: float = 0.8, lsh_index=None) -> List[Item]:
+    """
+    Drops entries that are near-duplicates of an earlier entry or of anything in `lsh_index`.
+
+    Each kept entry gets its MinHash signature in `minhash` so it can be persisted.
+    """
+    from src.processors.minhash import MinHashLSH, find_near_duplicates
+
+    index = lsh_index if lsh_index is not None else MinHashLSH(threshold)
+    keys = [entry.url or generate_hash(entry) for entry in entries]
+    texts = [f"{entry.title} {entry.content}" for entry in entries]
+    flags, signatures = find_near_duplicates(keys, texts, index)
+
+    kept = []
+    for key, entry, is_duplicate in zip(keys, entries, flags):
+        if is_duplicate:
+            logging.debug(f"Near-duplicate removed: {entry.title[:50]}...")
+            continue
+        entry.minhash = signatures[key]
+        kept.append(entry)
+    return kept
@@ -1,57 +1,279 @@
-
+import bisect
+import hashlib
+import json
 import logging
-from typing import List, Dict
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from src.pipeline.records import Item
+from src.storage import cache
+
+# Architecture components (diagram label -> synonyms). The label itself always matches;
+# matching is case-insensitive and treats hyphens and whitespace alike. Synonyms are
+# multi-word or unambiguous: everyday words ("agent", "tools", "prediction") would add
+# components to papers that only mention them in passing.
+ARCHITECTURE_VOCABULARY: Dict[str, List[str]] = {
+    "Input": ["inputs", "input data", "raw input"],
+    "Tokenizer": ["tokenization", "tokeniser", "byte pair encoding", "bpe", "sentencepiece", "wordpiece"],
+    "Embedding": ["embeddings", "embedding layer", "token embedding", "word embedding", "patch embedding"],
+    "Positional Encoding": ["position encoding", "positional embedding", "rotary embedding", "rope"],
+    "Encoder": ["encoder network", "text encoder", "feature encoder"],
+    "Vision Encoder": ["image encoder", "visual encoder", "vision backbone", "vision tower", "vit",
+                       "vision transformer"],
+    "Audio Encoder": ["speech encoder", "acoustic encoder"],
+    "Decoder": ["decoder network", "text decoder"],
+    "Transformer": ["transformer block", "transformer layer", "transformer encoder", "transformer decoder"],
+    "Attention": ["self attention", "cross attention", "multi head attention", "attention mechanism",
+                  "attention layer"],
+    "Mixture of Experts": ["moe", "mixture of experts layer", "expert routing", "expert router"],
+    "Feed-Forward Network": ["feed forward network", "feedforward network", "ffn", "mlp", "multilayer perceptron"],
+    "CNN": ["convolutional neural network", "convolutional network", "convolution", "convolutional layer",
+            "resnet", "u net", "unet"],
+    "RNN": ["recurrent neural network", "lstm", "gru", "recurrent network"],
+    "State Space Model": ["ssm", "mamba", "state space layer"],
+    "Graph Neural Network": ["gnn", "graph network", "graph convolution", "gcn", "message passing"],
+    "Language Model": ["llm", "large language model", "foundation model", "pretrained language model"],
+    "Vision-Language Model": ["vlm", "multimodal model", "multimodal llm", "mllm"],
+    "Projector": ["projection layer", "projection head", "adapter", "q former"],
+    "Retriever": ["retrieval", "dense retriever", "retrieval module", "document retriever", "bm25"],
+    "Reranker": ["re ranker", "reranking", "cross encoder"],
+    "Vector Database": ["vector store", "vector index", "knowledge base", "document store"],
+    "Memory": ["memory module", "external memory", "memory bank", "kv cache"],
+    "Diffusion": ["diffusion model", "denoising diffusion", "ddpm", "latent diffusion", "score based model",
+                  "denoiser"],
+    "VAE": ["variational autoencoder", "latent encoder"],
+    "GAN": ["generative adversarial network", "generator network", "discriminator network"],
+    "Noise Scheduler": ["noise schedule", "sampling schedule", "diffusion sampler"],
+    "Latent Space": ["latent representation", "latents", "latent variables"],
+    "Policy": ["policy network", "actor network", "policy model"],
+    "Value Function": ["critic", "value network", "q function"],
+    "Reward Model": ["reward function", "preference model"],
+    "Environment": ["environment simulator", "environment feedback"],
+    "Planner": ["planning module", "task planner"],
+    "Tool Use": ["tool calling", "function calling", "api calls"],
+    "Pooling": ["pooling layer", "global pooling", "mean pooling"],
+    "Normalization": ["layer norm", "layernorm", "batch norm", "batchnorm", "rmsnorm", "normalization layer"],
+    "Classifier": ["classification head", "classifier head", "softmax classifier", "linear classifier"],
+    "Regression Head": ["regressor", "regression layer"],
+    "Detection Head": ["object detector", "detector", "bounding box head"],
+    "Segmentation Head": ["segmentation decoder", "mask decoder", "mask head"],
+    "Loss": ["loss function", "training objective", "contrastive loss", "cross entropy"],
+    "Fine-Tuning": ["fine tuning", "finetuning", "lora", "instruction tuning", "supervised fine tuning", "sft"],
+    "RLHF": ["reinforcement learning from human feedback", "ppo", "dpo", "preference optimization"],
+    "Distillation": ["knowledge distillation", "teacher model", "student model"],
+    "Quantization": ["quantized model", "low bit quantization"],
+    "Prompt": ["prompting", "prompt template", "chain of thought"],
+    "Output": ["outputs", "output layer", "generated output"],
+}
+
+# Extra vocabulary: a JSON file {label: [synonyms]} merged over the built-in one
+DIAGRAM_VOCABULARY_PATH = os.environ.get("DIAGRAM_VOCABULARY_PATH", "")
+
+# Larger diagrams are cut to the first components mentioned
+DIAGRAM_MAX_STEPS = 12
+
+NOT_ENOUGH_INFO = "%% Not enough architecture info to generate flowchart."
+FAILED = "%% Diagram generation failed."
+
+# A sentence ends at . ! ? followed by whitespace (or the end of the text)
+SENTENCE_END_PATTERN = re.compile(r"[.!?](?:\s+|$)")
+SEPARATOR_PATTERN = re.compile(r"[\s\-]+")
+
+def normalize_term(term: str) -> str:
+    return SEPARATOR_PATTERN.sub(" ", term.strip().lower())
+
+def load_vocabulary(path: str = DIAGRAM_VOCABULARY_PATH) -> Dict[str, List[str]]:
+    """
+    Returns the built-in vocabulary, extended with the JSON file at `path` if set.
+    Labels containing a double quote are skipped: they would end the quoted
+    Mermaid node text early and break the diagram.
+    """
+    vocabulary = {label: list(synonyms) for label, synonyms in ARCHITECTURE_VOCABULARY.items()}
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for label, synonyms in json.load(f).items():
+                    if '"' in label or "\n" in label:
+                        logging.warning(f"Skipping diagram label {label!r} from {path}: "
+                                        "quotes and newlines are not allowed")
+                        continue
+                    if isinstance(synonyms, str):
+                        synonyms = [synonyms]
+                    vocabulary.setdefault(label, []).extend(synonyms)
+        except Exception as e:
+            logging.warning(f"Failed to load diagram vocabulary from {path}: {e}")
+    return vocabulary
+
+def _trie_pattern(terms: List[str]) -> str:
+    """
+    Compiles terms into one regex alternation factored by common prefix, so a
+    match attempt walks at most one term's length whatever the vocabulary size.
+    Longer terms are tried first ("vision encoder" before "vision").
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict) -> str:
+        branches = [(r"[\s\-]+" if char == " " else re.escape(char)) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+class ArchitectureMatcher:
+    """
+    Finds architecture components in text with a single compiled pattern.
+
+    Every label and synonym goes into one prefix-factored regex, so scanning is
+    linear in the text length and does not grow with the number of terms. Text
+    is lowercased once up front, which is cheaper than a case-insensitive
+    pattern. Plurals ("encoders", "transformers") match their singular term.
+    """
+
+    def __init__(self, vocabulary: Dict[str, List[str]]):
+        self.labels: Dict[str, str] = {}
+        for label, synonyms in vocabulary.items():
+            for term in [label, *synonyms]:
+                self.labels.setdefault(normalize_term(term), label)
+        self.pattern = re.compile(r"\b(" + _trie_pattern(list(self.labels)) + r")(?:e?s)?\b")
+        self.fingerprint = hashlib.sha256(json.dumps(sorted(self.labels.items())).encode("utf-8")).hexdigest()[:16]
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Returns (position, label) for every component mention in lowercased `text`, in order.
+        """
+        labels = self.labels
+        mentions = []
+        for match in self.pattern.finditer(text):
+            term = match.group(1)
+            label = labels.get(term) or labels[normalize_term(term)]  # "vision-encoder", "vision  encoder"
+            mentions.append((match.start(), label))
+        return mentions
+
+    def extract(self, text: str, max_steps: int = DIAGRAM_MAX_STEPS) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Extracts diagram steps and edges from a text.
+
+        Steps are the components in order of first mention. An edge A -> B is
+        added when B follows A in the same sentence; if no sentence mentions
+        two components, the steps are chained in order instead.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (steps, edges).
+        """
+        text = text.lower()
+        mentions = self.find(text)
+        steps = list(dict.fromkeys(label for _, label in mentions))[:max_steps]
+        kept = set(steps)
+
+        sentence_ends = [match.end() for match in SENTENCE_END_PATTERN.finditer(text)]
+        edges: Dict[Tuple[str, str], None] = {}
+        previous_sentence, previous_label = -1, None
+        for position, label in mentions:
+            if label not in kept:
+                continue
+            sentence = bisect.bisect_right(sentence_ends, position)
+            if (sentence == previous_sentence and previous_label != label
+                    and (label, previous_label) not in edges):
+                edges[(previous_label, label)] = None
+            previous_sentence, previous_label = sentence, label
+
+        if not edges and len(steps) >= 2:
+            edges = dict.fromkeys(zip(steps, steps[1:]))
+        return steps, list(edges)
+
+@lru_cache(maxsize=1)
+def get_matcher() -> ArchitectureMatcher:
+    return ArchitectureMatcher(load_vocabulary())
+
+def node_id(label: str) -> str:
+    return re.sub(r"\W", "", label) or "Node"
+
+def render_mermaid(edges: List[Tuple[str, str]]) -> str:
+    """
+    Renders edges as a Mermaid flowchart code block.
+    """
+    diagram = ["```mermaid", "graph TD"]
+    for source, target in edges:
+        diagram.append(f'    {node_id(source)}["{source}"] --> {node_id(target)}["{target}"]')
+    diagram.append("```")
+    return "\n".join(diagram)
 
 def extract_flowchart_steps(summary: str) -> List[str]:
     """
-    Heuristically extract architecture steps from a summary or method description.
-    You can later replace this with NLP chunking or even a GPT model.
+    Extract architecture steps from a summary or method description.
 
     Args:
-        summary (str): Summarized text from a paper
+        summary (str): Abstract or summarized text from a paper
 
     Returns:
-        List[str]: Ordered list of architecture steps
+        List[str]: Architecture components in order of first mention
     """
-    # Simplistic approach: split by indicative connectors
-    keywords = ["input", "embedding", "encoder", "decoder", "attention", "classifier", "output"]
-    steps = []
+    return get_matcher().extract(summary or "")[0]
 
-    for word in keywords:
-        if word in summary.lower():
-            steps.append(word.title())  # capitalize for visual clarity
+def diagram_for_text(text: str, matcher: Optional[ArchitectureMatcher] = None) -> str:
+    steps, edges = (matcher or get_matcher()).extract(text or "")
+    if len(steps) < 2 or not edges:
+        return NOT_ENOUGH_INFO
+    return render_mermaid(edges)
 
-    # Ensure no duplicates and preserve order
-    return list(dict.fromkeys(steps))
-
-
-def generate_mermaid_diagram(entry: Dict) -> str:
+def generate_mermaid_diagrams(entries: List[Item], use_cache: bool = True) -> List[str]:
     """
-    Generates a simple Mermaid.js flowchart from paper summary.
+    Generates Mermaid flowcharts for many papers in one pass.
+
+    Each diagram is built from the full abstract (`content`, falling back to
+    `summary`) and cached by content hash and vocabulary, so unchanged papers
+    are not re-scanned on later runs. Sets `diagram` on entries with one.
 
     Args:
-        entry (Dict): A paper or news item with a summary
+        entries (List[Item]): Papers (or news items).
+        use_cache (bool): Reuse diagrams from the inference cache.
 
     Returns:
-        str: Mermaid diagram code block (flowchart)
+        List[str]: Mermaid code block (or a "%%" note) per entry, in order.
     """
-    try:
-        summary = entry.get("summary", "")
-        steps = extract_flowchart_steps(summary)
+    matcher = get_matcher()
+    texts = [entry.content or entry.summary for entry in entries]
+    keys = [cache.make_key("architecture-matcher", {"vocabulary": matcher.fingerprint}, text) for text in texts]
+    diagrams = cache.get_many("diagram", keys) if use_cache else {}
+
+    new_diagrams = {}
+    for key, text in zip(keys, texts):
+        if key not in diagrams and key not in new_diagrams:
+            try:
+                new_diagrams[key] = diagram_for_text(text, matcher)
+            except Exception as e:
+                logging.error(f"Failed to generate diagram: {e}")
+                new_diagrams[key] = FAILED
+    if use_cache:
+        cache.put_many("diagram", {key: diagram for key, diagram in new_diagrams.items() if diagram != FAILED})
+    diagrams.update(new_diagrams)
 
-        if len(steps) < 2:
-            return "%% Not enough architecture info to generate flowchart."
+    results = []
+    for entry, key in zip(entries, keys):
+        diagram = diagrams[key]
+        if diagram.startswith("```"):
+            entry.diagram = diagram
+        results.append(diagram)
+    return results
 
-        # Build Mermaid code block
-        diagram = ["```mermaid", "graph TD"]
-        for i in range(len(steps) - 1):
-            diagram.append(f"    {steps[i]} --> {steps[i+1]}")
-        diagram.append("```")
+def generate_mermaid_diagram(entry: Item) -> str:
+    """
+    Generates a Mermaid.js flowchart for one paper (see generate_mermaid_diagrams).
 
-        mermaid_code = "\n".join(diagram)
-        entry["diagram"] = mermaid_code
-        return mermaid_code
+    Args:
+        entry (Item): A paper or news item with an abstract or summary
 
-    except Exception as e:
-        logging.error(f"Failed to generate diagram: {e}")
-        return "%% Diagram generation failed."
+    Returns:
+        str: Mermaid diagram code block (flowchart)
+    """
+    return generate_mermaid_diagrams([entry])[0]
@@ -0,0 +1,135 @@
+import logging
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3  # words per shingle
+SEED = 1
+
+# NewsAPI truncation marker, e.g. "... [+1234 chars]"
+_TRUNCATION_RE = re.compile(r"\[\+\d+ chars\]")
+_WORD_RE = re.compile(r"\w+")
+
+_rng = np.random.RandomState(SEED)
+# Multiply-shift hash family: h(x) = (a * x + b) >> 32 over uint64 (wraparound is intended)
+_A = _rng.randint(1, 2 ** 63 - 1, size=NUM_PERM, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+_B = _rng.randint(0, 2 ** 63 - 1, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_EMPTY = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hashes the word n-grams of a text to 32-bit integers (stable across runs).
+    """
+    words = _WORD_RE.findall(_TRUNCATION_RE.sub(" ", text.lower()))
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in set(grams)), dtype=np.uint64)
+
+def minhash_signature(text: str) -> np.ndarray:
+    """
+    Computes a NUM_PERM-value MinHash signature for one text.
+
+    Returns:
+        np.ndarray: uint32 array of shape (NUM_PERM,).
+    """
+    hashes = shingle_hashes(text)
+    if hashes.size == 0:
+        return _EMPTY.copy()
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _A[None, :] + _B[None, :]) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+def minhash_signatures(texts: Iterable[str]) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: uint32 array of shape (len(texts), NUM_PERM).
+    """
+    signatures = [minhash_signature(text) for text in texts]
+    return np.vstack(signatures) if signatures else np.empty((0, NUM_PERM), dtype=np.uint32)
+
+def optimal_bands(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    Picks (bands, rows) with bands * rows <= num_perm whose S-curve midpoint
+    (1 / bands) ** (1 / rows) is closest to the Jaccard threshold.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+class MinHashLSH:
+    """
+    Locality-sensitive hashing index over MinHash signatures.
+
+    Signatures are split into bands; two items become candidates when any band
+    matches exactly, and candidates are confirmed with the estimated Jaccard
+    similarity. Lookups cost O(bands) instead of a scan over all items.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = NUM_PERM):
+        self.threshold = threshold
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self._buckets: List[Dict[bytes, List[str]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def insert(self, key: str, signature: np.ndarray):
+        self._signatures[key] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band][band_key]
+            if key not in bucket:
+                bucket.append(key)
+
+    def query(self, signature: np.ndarray, exclude: Optional[str] = None) -> Optional[str]:
+        """
+        Args:
+            signature (np.ndarray): MinHash signature to look up.
+            exclude (Optional[str]): Key to ignore, so an item collected again
+                does not match its own stored signature.
+
+        Returns:
+            Optional[str]: Key of an indexed near-duplicate, or None.
+        """
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        candidates.discard(exclude)
+        for key in candidates:
+            if np.mean(self._signatures[key] == signature) >= self.threshold:
+                return key
+        return None
+
+def find_near_duplicates(keys: List[str], texts: List[str], index: MinHashLSH) -> Tuple[List[bool], Dict[str, np.ndarray]]:
+    """
+    Checks texts against the index (and each other) and inserts the unique ones.
+
+    Returns:
+        Tuple[List[bool], Dict[str, np.ndarray]]: Duplicate flag per text, and
+        the signatures of the newly inserted texts keyed by `keys`.
+    """
+    signatures = minhash_signatures(texts)
+    flags, inserted = [], {}
+    for key, signature in zip(keys, signatures):
+        match = index.query(signature, exclude=key)
+        if match is not None:
+            logging.debug(f"Near-duplicate of {match}: {key}")
+            flags.append(True)
+            continue
+        index.insert(key, signature)
+        inserted[key] = signature
+        flags.append(False)
+    return flags, inserted
@@ -0,0 +1,234 @@
+import importlib.util
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Task for each model the pipeline knows how to build.
+MODEL_TASKS: Dict[str, str] = {
+    "facebook/bart-large-cnn": "summarization",
+    "google/flan-t5-base": "text2text-generation",
+    "sentence-transformers/all-MiniLM-L6-v2": "sentence-embedding",
+}
+
+SUMMARIZER_MODEL = "facebook/bart-large-cnn"
+INSIGHTS_MODEL = "google/flan-t5-base"
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Inference backend per generation model: 'pytorch' (fp32), 'int8' (PyTorch dynamic
+# quantization of Linear layers) or 'onnx' (ONNX Runtime with KV-cache decoding,
+# needs `pip install optimum[onnxruntime]`). Unavailable backends fall back to 'pytorch'.
+BACKENDS = ("pytorch", "int8", "onnx")
+MODEL_BACKENDS: Dict[str, str] = {
+    SUMMARIZER_MODEL: os.environ.get("SUMMARIZER_BACKEND", "pytorch"),
+    INSIGHTS_MODEL: os.environ.get("INSIGHTS_BACKEND", "pytorch"),
+}
+
+# ONNX exports are saved here on first load and reused afterwards
+ONNX_MODEL_DIR = os.environ.get("ONNX_MODEL_DIR", "data/onnx")
+
+# Maximum number of pipelines kept in memory at once (least recently used is evicted)
+MAX_LOADED_MODELS = int(os.environ.get("MAX_LOADED_MODELS", "3"))
+
+# Guards the registry dicts only; each model is built under its own lock, so a slow
+# load (e.g. warm_models in the background) does not block lookups of loaded models
+_lock = threading.RLock()
+_build_locks: Dict[str, threading.Lock] = {}
+
+# "model@requested backend" -> (pipeline, backend actually loaded after any fallback)
+_pipelines: "OrderedDict[str, Tuple[object, str]]" = OrderedDict()
+# Backend of the most recently used pipeline per model
+_effective_backends: Dict[str, str] = {}
+# "model@requested backend" -> backend used instead, once a load has fallen back
+_fallbacks: Dict[str, str] = {}
+
+# Packages each optional backend needs
+BACKEND_PACKAGES: Dict[str, Tuple[str, ...]] = {
+    "int8": ("torch",),
+    "onnx": ("optimum.onnxruntime", "onnxruntime"),
+}
+
+def _build_int8(task: str, model_name: str):
+    import torch
+    from transformers import pipeline
+
+    pipe = pipeline(task, model=model_name, tokenizer=model_name)
+    pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipe
+
+def _build_onnx(task: str, model_name: str):
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+
+    # The checkpoint is converted once and saved; use_cache enables KV-cache decoding
+    path = os.path.join(ONNX_MODEL_DIR, model_name.replace("/", "--"))
+    if os.path.exists(os.path.join(path, "config.json")):
+        model = ORTModelForSeq2SeqLM.from_pretrained(path, use_cache=True)
+    else:
+        logging.info(f"Exporting {model_name} to ONNX in {path}...")
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True)
+        try:
+            tmp = f"{path}.tmp-{os.getpid()}"
+            model.save_pretrained(tmp)
+            os.replace(tmp, path)
+        except OSError as e:
+            # Another process saved it first, or the directory is not writable
+            logging.warning(f"Could not save the ONNX export of {model_name}: {e}")
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model_name))
+
+@lru_cache(maxsize=None)
+def backend_available(backend: str) -> bool:
+    """
+    Whether the packages `backend` needs are installed (checked once, without importing them).
+    """
+    try:
+        return all(importlib.util.find_spec(name) is not None for name in BACKEND_PACKAGES.get(backend, ()))
+    except (ImportError, ValueError):
+        return False
+
+def _build_pipeline(model_name: str, backend: str = "pytorch") -> Tuple[object, str]:
+    task = MODEL_TASKS.get(model_name)
+    if task is None:
+        raise ValueError(f"Unknown model: {model_name}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    logging.info(f"Loading {task} pipeline for {model_name} ({backend})...")
+
+    # transformers/torch are imported here so that importing this module stays cheap
+    if task == "sentence-embedding":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name), "pytorch"
+
+    if backend != "pytorch" and not backend_available(backend):
+        logging.warning(f"{backend} backend not installed, using pytorch for {model_name}.")
+    elif backend != "pytorch":
+        try:
+            return (_build_int8 if backend == "int8" else _build_onnx)(task, model_name), backend
+        except Exception as e:
+            logging.warning(f"{backend} backend unavailable for {model_name}, using pytorch: {e}")
+
+    from transformers import pipeline
+    return pipeline(task, model=model_name, tokenizer=model_name), "pytorch"
+
+def get_backend(model_name: str) -> str:
+    """
+    Returns the backend in use (or configured, if not loaded yet) for a model.
+    """
+    return _effective_backends.get(model_name) or MODEL_BACKENDS.get(model_name, "pytorch")
+
+def resolve_backend(model_name: str, backend: Optional[str] = None) -> str:
+    """
+    Returns the backend a load of `model_name` uses (or used), without loading it:
+    pytorch if the requested backend is not installed or a load already fell back.
+    """
+    backend = backend or MODEL_BACKENDS.get(model_name, "pytorch")
+    if MODEL_TASKS.get(model_name) == "sentence-embedding" or backend == "pytorch":
+        return "pytorch"
+    if not backend_available(backend):
+        return "pytorch"
+    return _fallbacks.get(f"{model_name}@{backend}", backend)
+
+def model_cache_id(model_name: str) -> str:
+    """
+    Identifies model + backend for inference-cache keys; outputs differ between
+    backends, so quantized/ONNX results never mix with fp32 ones.
+
+    The backend is the one the model loads with after any fallback, worked out
+    without loading it, so runs served entirely from cache never load a model.
+    """
+    backend = resolve_backend(model_name)
+    return model_name if backend == "pytorch" else f"{model_name}@{backend}"
+
+def _load(model_name: str, backend: Optional[str] = None) -> Tuple[object, str]:
+    backend = backend or MODEL_BACKENDS.get(model_name, "pytorch")
+    key = f"{model_name}@{backend}"
+    with _lock:
+        entry = _pipelines.get(key)
+        if entry is not None:
+            _pipelines.move_to_end(key)
+            _effective_backends[model_name] = entry[1]
+            return entry
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    with build_lock:
+        with _lock:
+            entry = _pipelines.get(key)  # another thread may have built it meanwhile
+        if entry is None:
+            entry = _build_pipeline(model_name, backend)
+            with _lock:
+                if entry[1] != backend:
+                    _fallbacks[key] = entry[1]
+                _pipelines[key] = entry
+                while len(_pipelines) > max(1, MAX_LOADED_MODELS):
+                    evicted, _ = _pipelines.popitem(last=False)
+                    logging.info(f"Evicted {evicted} from model registry.")
+    with _lock:
+        _effective_backends[model_name] = entry[1]
+    return entry
+
+def get_pipeline(model_name: str, backend: Optional[str] = None):
+    """
+    Returns the shared pipeline for a model, loading it on first use.
+
+    Args:
+        model_name (str): HuggingFace model id registered in MODEL_TASKS.
+        backend (Optional[str]): Override of MODEL_BACKENDS for this call.
+
+    Returns:
+        transformers.Pipeline: The cached pipeline.
+    """
+    return _load(model_name, backend)[0]
+
+def is_loaded(model_name: str) -> bool:
+    return any(key.split("@")[0] == model_name for key in _pipelines)
+
+def unload(model_name: Optional[str] = None):
+    """
+    Drops one model (or all models) from the registry so its memory can be reclaimed.
+
+    Args:
+        model_name (Optional[str]): Model to unload; unloads everything when None.
+    """
+    with _lock:
+        if model_name is None:
+            _pipelines.clear()
+            _effective_backends.clear()
+        else:
+            for key in [key for key in _pipelines if key.split("@")[0] == model_name]:
+                del _pipelines[key]
+            _effective_backends.pop(model_name, None)
+
+    import gc
+    gc.collect()
+    logging.info(f"Unloaded {model_name or 'all models'}.")
+
+def warm_models(model_names: List[str] = None, background: bool = True) -> Optional[threading.Thread]:
+    """
+    Loads models ahead of time, optionally in a background thread.
+
+    Args:
+        model_names (List[str]): Models to load (default: summarizer, insights and embedding models).
+        background (bool): If True, load in a daemon thread and return it.
+
+    Returns:
+        Optional[threading.Thread]: The loader thread when running in background.
+    """
+    model_names = model_names or [SUMMARIZER_MODEL, INSIGHTS_MODEL, EMBEDDING_MODEL]
+
+    def _load():
+        for name in model_names:
+            try:
+                get_pipeline(name)
+            except Exception as e:
+                logging.warning(f"Failed to warm {name}: {e}")
+
+    if not background:
+        _load()
+        return None
+
+    thread = threading.Thread(target=_load, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,122 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional
+
+# Default worker count for parallel inference (1 = run in-process)
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", "1"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_config = None
+
+def _init_worker(torch_threads: int, warm: List[str]):
+    # Pin intra-op threads so N workers don't oversubscribe the cores
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    os.environ["MKL_NUM_THREADS"] = str(torch_threads)
+    import torch
+    torch.set_num_threads(torch_threads)
+
+    # Each worker loads its models once, up front
+    from src.processors.model_registry import warm_models
+    warm_models(warm, background=False)
+
+def _summarize_shard(texts: List[str], kwargs: dict) -> List[str]:
+    from src.processors.summarizer import summarize_batch_with_huggingface
+    return summarize_batch_with_huggingface(texts, **kwargs)
+
+def _insights_shard(summaries: List[str], mode: str = "fields") -> List[dict]:
+    from src.processors.summarizer import extract_insights_batch
+    return extract_insights_batch(summaries, workers=1, mode=mode)
+
+def default_torch_threads(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // workers)
+
+def get_pool(workers: int, torch_threads: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Returns the shared worker pool, (re)creating it if the configuration changed
+    or a worker died. Workers use the 'spawn' start method, which is safe with torch.
+    """
+    global _pool, _pool_config
+    from src.processors.model_registry import SUMMARIZER_MODEL, INSIGHTS_MODEL
+
+    torch_threads = torch_threads or default_torch_threads(workers)
+    config = (workers, torch_threads)
+    if _pool is None or _pool_config != config or getattr(_pool, "_broken", False):
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(torch_threads, [SUMMARIZER_MODEL, INSIGHTS_MODEL]),
+        )
+        _pool_config = config
+        logging.info(f"Started inference pool: {workers} workers x {torch_threads} torch threads.")
+    return _pool
+
+def shutdown_pool():
+    global _pool, _pool_config
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+    _pool, _pool_config = None, None
+
+def _shards(values: list, workers: int) -> List[range]:
+    # Contiguous, near-equal shards; several per worker so a crash loses little work
+    count = min(len(values), workers * 4)
+    size = -(-len(values) // count)
+    return [range(start, min(start + size, len(values))) for start in range(0, len(values), size)]
+
+def map_sharded(fn: Callable, values: list, workers: int, fallback: Callable[[list], list],
+                torch_threads: Optional[int] = None, extra_args: tuple = ()) -> list:
+    """
+    Runs `fn(shard, *extra_args)` over shards of `values` in the worker pool and
+    returns results in input order.
+
+    A shard whose worker crashed is retried once on a fresh pool, then run
+    in-process with `fallback`, so a dead worker never loses the run.
+    """
+    if not values:
+        return []
+    results = [None] * len(values)
+    pending = _shards(values, workers)
+
+    for attempt in range(2):
+        pool = get_pool(workers, torch_threads)
+        futures = [(shard, pool.submit(fn, [values[i] for i in shard], *extra_args)) for shard in pending]
+        failed = []
+        for shard, future in futures:
+            try:
+                for i, value in zip(shard, future.result()):
+                    results[i] = value
+            except BrokenProcessPool as e:
+                logging.warning(f"Inference worker crashed on items {shard.start}-{shard.stop - 1}: {e}")
+                failed.append(shard)
+        if not failed:
+            return results
+        shutdown_pool()
+        pending = failed
+
+    for shard in pending:
+        logging.warning(f"Running items {shard.start}-{shard.stop - 1} in-process after worker crashes.")
+        for i, value in zip(shard, fallback([values[i] for i in shard])):
+            results[i] = value
+    return results
+
+def parallel_summarize(texts: List[str], workers: int, torch_threads: Optional[int] = None, **kwargs) -> List[str]:
+    """
+    Summarizes texts across `workers` processes (see summarize_batch_with_huggingface for kwargs).
+    """
+    from src.processors.summarizer import summarize_batch_with_huggingface
+    return map_sharded(_summarize_shard, texts, workers,
+                       fallback=lambda shard: summarize_batch_with_huggingface(shard, **kwargs),
+                       torch_threads=torch_threads, extra_args=(kwargs,))
+
+def parallel_insights(summaries: List[str], workers: int, torch_threads: Optional[int] = None,
+                      mode: str = "fields") -> List[dict]:
+    """
+    Extracts insights for many summaries across `workers` processes.
+    """
+    return map_sharded(_insights_shard, summaries, workers,
+                       fallback=lambda shard: _insights_shard(shard, mode),
+                       torch_threads=torch_threads, extra_args=(mode,))
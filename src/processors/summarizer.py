@@ -1,18 +1,33 @@
+import json
 import logging
-from typing import List, Dict
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+from functools import lru_cache
+from typing import List, Dict, Optional
+from src.processors.model_registry import get_pipeline, model_cache_id, SUMMARIZER_MODEL, INSIGHTS_MODEL
+from src.processors.parallel import INFERENCE_WORKERS, parallel_summarize, parallel_insights
+from src.pipeline import metrics
+from src.pipeline.records import Item
+from src.storage import cache
+
+# Overlap between consecutive chunks of long inputs, in tokens
+CHUNK_OVERLAP = 64
+
+# Structured insights: field name -> question asked of the insights model
+INSIGHT_FIELDS = {
+    "Problem Statement": "What problem does the paper address?",
+    "Dataset Used": "Which dataset is used?",
+    "Model Type": "What type of model is proposed or used?",
+    "Evaluation Metrics": "Which evaluation metrics are reported?",
+}
+# Per-answer generation cap for field extraction, and for the legacy JSON mode
+FIELD_MAX_NEW_TOKENS = 24
+INSIGHTS_JSON_MAX_NEW_TOKENS = 128
+# Answers treated as "not stated"
+EMPTY_ANSWERS = {"", "unknown", "none", "n/a", "not stated", "not mentioned", "not specified"}
 
 # if using OpenAI
 # import openai
 # import yaml
 
-# Initialize Hugging Face summarizer
-hf_summarizer = pipeline(
-    "summarization",
-    model="facebook/bart-large-cnn",
-    tokenizer="facebook/bart-large-cnn"
-)
-
 # Optionally load OpenAI key from config.yaml
 # def load_openai_key():
 #     with open("config/config.yaml", "r") as f:
@@ -20,12 +35,167 @@ hf_summarizer = pipeline(
 
 def summarize_with_huggingface(text: str, max_length=33, min_length=30) -> str:
     try:
-        summary = hf_summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)
+        hf_summarizer = get_pipeline(SUMMARIZER_MODEL)
+        summary = hf_summarizer(text, max_length=max_length, min_length=min_length, do_sample=False,
+                                truncation=True)
         return summary[0]["summary_text"]
     except Exception as e:
         logging.warning(f"HuggingFace summarization failed: {e}")
         return ""
 
+def make_length_buckets(lengths: List[int], batch_size: int = 8, max_batch_tokens: int = 4096) -> List[List[int]]:
+    """
+    Groups item indices into batches of similar token length.
+
+    Indices are sorted by length so each batch pads to a close maximum. A batch
+    is closed once it holds `batch_size` items or once its padded size
+    (longest item * number of items) would exceed `max_batch_tokens`.
+
+    Args:
+        lengths (List[int]): Token length of each item.
+        batch_size (int): Maximum number of items per batch.
+        max_batch_tokens (int): Maximum padded tokens per batch.
+
+    Returns:
+        List[List[int]]: Batches of indices into `lengths`.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, current, longest = [], [], 0
+
+    for i in order:
+        padded = max(longest, lengths[i]) * (len(current) + 1)
+        if current and (len(current) >= batch_size or padded > max_batch_tokens):
+            batches.append(current)
+            current, longest = [], 0
+        current.append(i)
+        longest = max(longest, lengths[i])
+
+    if current:
+        batches.append(current)
+    return batches
+
+def _summarize_fitting(texts: List[str], lengths: List[int], max_length: int, min_length: int,
+                       batch_size: int, max_batch_tokens: int) -> List[str]:
+    # Texts here already fit the model window; truncation=True only guards tokenizer drift
+    hf_summarizer = get_pipeline(SUMMARIZER_MODEL)
+    summaries = [""] * len(texts)
+    for batch in make_length_buckets(lengths, batch_size, max_batch_tokens):
+        batch_texts = [texts[i] for i in batch]
+        try:
+            outputs = hf_summarizer(batch_texts, max_length=max_length, min_length=min_length,
+                                    do_sample=False, truncation=True, batch_size=len(batch))
+            for i, output in zip(batch, outputs):
+                summaries[i] = output["summary_text"]
+        except Exception as e:
+            logging.warning(f"HuggingFace batch summarization failed, retrying per item: {e}")
+            for i in batch:
+                summaries[i] = summarize_with_huggingface(texts[i], max_length, min_length)
+    return summaries
+
+@lru_cache(maxsize=1)
+def get_summarizer_tokenizer():
+    # Loaded on its own so chunking doesn't need the full model in memory
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(SUMMARIZER_MODEL)
+
+def model_window() -> int:
+    """
+    Maximum input tokens per summarizer call, leaving room for special tokens.
+    """
+    return min(get_summarizer_tokenizer().model_max_length, 1024) - 2
+
+def chunk_text(text: str, max_tokens: Optional[int] = None, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """
+    Splits text into overlapping windows of at most `max_tokens` summarizer tokens.
+
+    Windows are cut on token boundaries using the tokenizer's character offsets,
+    so every chunk is a verbatim slice of `text`.
+
+    Args:
+        text (str): Text to split.
+        max_tokens (Optional[int]): Window size (default: the model window).
+        overlap (int): Tokens shared by consecutive windows.
+
+    Returns:
+        List[str]: Chunks in document order (just [text] if it already fits).
+    """
+    max_tokens = max_tokens or model_window()
+    encoding = get_summarizer_tokenizer()(text, add_special_tokens=False, return_offsets_mapping=True)
+    offsets = encoding["offset_mapping"]
+    if len(offsets) <= max_tokens:
+        return [text]
+
+    step = max_tokens - min(overlap, max_tokens // 4)
+    chunks = []
+    for start in range(0, len(offsets), step):
+        window = offsets[start:start + max_tokens]
+        chunks.append(text[window[0][0]:window[-1][1]])
+        if start + max_tokens >= len(offsets):
+            break
+    return chunks
+
+def summarize_batch_with_huggingface(texts: List[str], max_length=33, min_length=30,
+                                     batch_size: int = 8, max_batch_tokens: int = 4096) -> List[str]:
+    """
+    Summarizes many texts with length-bucketed batches of the HuggingFace pipeline.
+
+    Texts longer than the model window are summarized map-reduce style: they are
+    split into overlapping token windows, all windows of all documents are
+    summarized in one batched pass (map, cached per chunk so a partially changed
+    document reuses unchanged chunks), and the joined chunk summaries are then
+    summarized together with the short texts (reduce).
+
+    Args:
+        texts (List[str]): Texts to summarize.
+        max_length (int): Maximum summary length in tokens.
+        min_length (int): Minimum summary length in tokens.
+        batch_size (int): Maximum number of texts per forward pass.
+        max_batch_tokens (int): Maximum padded input tokens per forward pass.
+
+    Returns:
+        List[str]: Summaries in the same order as `texts` ("" on failure).
+    """
+    if not texts:
+        return []
+
+    tokenizer = get_summarizer_tokenizer()
+    window = model_window()
+    map_params = {"max_length": max(2 * max_length, 64), "min_length": max(min_length // 2, 10)}
+    model_id = model_cache_id(SUMMARIZER_MODEL)
+
+    texts = list(texts)
+    lengths = [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+    metrics.add_tokens("summarize", sum(lengths))
+    long_docs = [i for i, length in enumerate(lengths) if length > window]
+
+    # Map/reduce rounds until every document fits (one round unless inputs are huge)
+    while long_docs:
+        doc_chunks = {i: chunk_text(texts[i], window) for i in long_docs}
+        chunks = list(dict.fromkeys(c for doc in doc_chunks.values() for c in doc))
+        keys = {chunk: cache.make_key(model_id, map_params, chunk) for chunk in chunks}
+        cached = cache.get_many("chunk_summary", keys.values())
+
+        missing = [chunk for chunk in chunks if keys[chunk] not in cached]
+        missing_lengths = [min(len(ids), window) for ids in
+                           tokenizer(missing, add_special_tokens=False)["input_ids"]] if missing else []
+        for chunk, summary in zip(missing, _summarize_fitting(missing, missing_lengths, batch_size=batch_size,
+                                                                max_batch_tokens=max_batch_tokens, **map_params)):
+            cached[keys[chunk]] = summary
+        cache.put_many("chunk_summary", {keys[c]: cached[keys[c]] for c in missing if cached[keys[c]]})
+
+        logging.info(f"Map pass: {len(chunks)} chunks from {len(long_docs)} long documents "
+                     f"({len(chunks) - len(missing)} cached).")
+        previous = {i: lengths[i] for i in long_docs}
+        for i, doc in doc_chunks.items():
+            texts[i] = " ".join(cached[keys[chunk]] for chunk in doc)
+            lengths[i] = len(tokenizer(texts[i], add_special_tokens=False)["input_ids"])
+        # A document whose joined summaries still don't fit goes round again, as long
+        # as each round shrinks it (otherwise the final pass truncates it)
+        long_docs = [i for i in long_docs if window < lengths[i] < previous[i]]
+
+    return _summarize_fitting(texts, [min(length, window) for length in lengths], max_length, min_length,
+                              batch_size, max_batch_tokens)
+
 # if using OpenAI
 # def summarize_with_openai(text: str) -> str:
 #     try:
@@ -44,43 +214,107 @@ def summarize_with_huggingface(text: str, max_length=33, min_length=30) -> str:
 #         logging.warning(f"OpenAI summarization failed: {e}")
 #         return ""
 
-def summarize_content(items: List[Dict], content_type="news", method="huggingface") -> List[Dict]:
+def summarize_content(items: List[Item], content_type="news", method="huggingface",
+                      batch_size: int = 8, max_batch_tokens: int = 4096, use_cache: bool = True,
+                      workers: Optional[int] = None) -> List[Item]:
     """
-    Adds a 'summary' field to each item using selected summarization method.
+    Sets `summary` on each item using selected summarization method.
 
     Args:
-        items (List[Dict]): List of news or papers.
+        items (List[Item]): List of news or papers.
         content_type (str): 'news' or 'paper'.
-        method (str): 'huggingface' or 'openai'.
+        method (str): 'huggingface' (batched), 'huggingface-single' (one call per item) or 'openai'.
+        batch_size (int): Maximum number of items per batch for the batched method.
+        max_batch_tokens (int): Maximum padded tokens per batch for the batched method.
+        use_cache (bool): Reuse summaries of identical text from the inference cache.
+        workers (Optional[int]): Worker processes for the batched method (default:
+            INFERENCE_WORKERS); 1 runs in-process.
 
     Returns:
-        List[Dict]: Same list with 'summary' field added.
+        List[Item]: Same list with `summary` set.
     """
     summarized_items = []
+    texts = []
     for item in items:
-        text = item.get("content") or item.get("summary") or item.get("description", "")
+        text = item.content or item.summary
         if not text:
-            item["summary"] = ""
+            item.summary = ""
             continue
+        summarized_items.append(item)
+        texts.append(text)
 
-        if method == "huggingface":
-            summary = summarize_with_huggingface(text)
-        # elif method == "openai":
-        #     summary = summarize_with_openai(text)  # requires OpenAI key and module
-        else:
-            raise ValueError("Unsupported summarization method")
+    params = {"max_length": 33, "min_length": 30}
+    model_id = model_cache_id(SUMMARIZER_MODEL)
+    keys = [cache.make_key(model_id, params, text) for text in texts]
+    cached = cache.get_many("summary", keys) if use_cache else {}
+    pending = [i for i, key in enumerate(keys) if key not in cached]
+    pending_texts = [texts[i] for i in pending]
 
-        item["summary"] = summary
-        summarized_items.append(item)
+    workers = workers or INFERENCE_WORKERS
+    if method == "huggingface" and workers > 1 and len(pending_texts) > 1:
+        summaries = parallel_summarize(pending_texts, workers, batch_size=batch_size,
+                                       max_batch_tokens=max_batch_tokens, **params)
+    elif method == "huggingface":
+        summaries = summarize_batch_with_huggingface(pending_texts, batch_size=batch_size,
+                                                     max_batch_tokens=max_batch_tokens, **params)
+    elif method == "huggingface-single":
+        summaries = [summarize_with_huggingface(text, **params) for text in pending_texts]
+    # elif method == "openai":
+    #     summaries = [summarize_with_openai(text) for text in pending_texts]  # requires OpenAI key and module
+    else:
+        raise ValueError("Unsupported summarization method")
+
+    new_summaries = dict(zip((keys[i] for i in pending), summaries))
+    if use_cache:
+        cache.put_many("summary", {key: summary for key, summary in new_summaries.items() if summary})
+
+    for item, key in zip(summarized_items, keys):
+        item.summary = cached[key] if key in cached else new_summaries[key]
 
-    logging.info(f"Summarized {len(summarized_items)} items using {method}.")
+    logging.info(f"Summarized {len(summarized_items)} items using {method} "
+                 f"({len(summarized_items) - len(pending)} from cache).")
     return summarized_items
-from transformers import pipeline
 
-# Load Flan-T5 model for instruction-style prompting
-flan_t5 = pipeline("text2text-generation", model="google/flan-t5-base")
+def parse_insights_output(output: str) -> Dict[str, str]:
+    """
+    Safely parses a generated JSON object into a flat dict of strings.
+
+    Flan-T5 often drops the outer braces or emits trailing text, so the first
+    "{...}" span is used when present and braces are added when missing.
+    Nothing is ever evaluated as code.
+
+    Args:
+        output (str): Raw generated text.
+
+    Returns:
+        Dict[str, str]: Parsed fields, or {} if the output is not a JSON object.
+    """
+    text = output.strip()
+    start, end = text.find("{"), text.rfind("}")
+    text = text[start:end + 1] if 0 <= start < end else "{" + text.strip(", ") + "}"
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    return {str(key): str(value).strip() for key, value in parsed.items()
+            if isinstance(value, (str, int, float)) and str(value).strip()}
+
+def clean_field_answer(answer: str) -> str:
+    """
+    Normalizes a short generated answer; placeholders like "unknown" become "".
+    """
+    answer = answer.strip().strip('"\'').rstrip(".").strip()
+    return "" if answer.lower() in EMPTY_ANSWERS else answer
 
 def extract_insights_with_flan(summary: str) -> Dict[str, str]:
+    """
+    Extracts insights with a single JSON-formatted generation (legacy mode).
+
+    Prefer extract_insight_fields, which is cheaper and far more reliable with
+    flan-t5-base; this mode is kept for larger instruction-tuned models.
+    """
     prompt = f"""
 Extract key insights in JSON format:
 Summary: {summary}
@@ -92,11 +326,98 @@ Return format:
   "Evaluation Metrics": "..."
 }}
 """
+    params = {"do_sample": False, "max_new_tokens": INSIGHTS_JSON_MAX_NEW_TOKENS}
+    key = cache.make_key(model_cache_id(INSIGHTS_MODEL), params, prompt)
+    insights = cache.get("insights", key)
+    if insights is not None:
+        return insights
+
     try:
-        output = flan_t5(prompt, do_sample=False)[0]['generated_text']
-        insights = eval(output) if output.startswith("{") else {}
-        logging.info(f'insights  - > {insights}')
+        flan_t5 = get_pipeline(INSIGHTS_MODEL)
+        output = flan_t5(prompt, **params)[0]['generated_text']
+        insights = parse_insights_output(output)
+        logging.debug(f"Insights: {insights}")
+        if insights:
+            cache.put("insights", key, insights)
         return insights
     except Exception as e:
         logging.warning(f"Flan-T5 insights extraction failed: {e}")
-        return {}
\ No newline at end of file
+        return {}
+
+def extract_insight_fields(summaries: List[str], fields: Optional[Dict[str, str]] = None,
+                           batch_size: int = 16,
+                           max_new_tokens: int = FIELD_MAX_NEW_TOKENS) -> List[Dict[str, str]]:
+    """
+    Extracts insights with one short, batched generation per field.
+
+    Each field is asked as its own question over all summaries at once, so the
+    model only produces a few tokens per answer and never has to emit valid
+    JSON. Answers are cached per (field, summary), so a new field or a changed
+    summary only regenerates what is missing.
+
+    Args:
+        summaries (List[str]): Paper summaries.
+        fields (Dict[str, str]): Field name -> question (default: INSIGHT_FIELDS).
+        batch_size (int): Prompts per generation batch.
+        max_new_tokens (int): Cap on generated tokens per answer.
+
+    Returns:
+        List[Dict[str, str]]: Insights in the same order as `summaries`; fields
+        the model could not answer are left out.
+    """
+    fields = fields or INSIGHT_FIELDS
+    results = [{} for _ in summaries]
+    todo = [i for i, summary in enumerate(summaries) if summary and summary.strip()]
+    if not todo:
+        return results
+
+    model_id = model_cache_id(INSIGHTS_MODEL)
+    for field, question in fields.items():
+        params = {"field": field, "question": question, "max_new_tokens": max_new_tokens}
+        keys = {i: cache.make_key(model_id, params, summaries[i]) for i in todo}
+        answers = cache.get_many("insight_field", keys.values())
+        pending = [i for i in todo if keys[i] not in answers]
+
+        if pending:
+            prompts = [f"Read the paper summary and answer the question in a few words. "
+                       f"If it is not stated, answer \"unknown\".\n"
+                       f"Summary: {summaries[i]}\nQuestion: {question}" for i in pending]
+            try:
+                flan_t5 = get_pipeline(INSIGHTS_MODEL)
+                outputs = flan_t5(prompts, batch_size=batch_size, max_new_tokens=max_new_tokens,
+                                  do_sample=False, truncation=True)
+                generated = {keys[i]: clean_field_answer(output[0]["generated_text"]
+                                                         if isinstance(output, list) else output["generated_text"])
+                             for i, output in zip(pending, outputs)}
+                # Empty answers are cached too, so "unknown" isn't regenerated every run
+                cache.put_many("insight_field", generated)
+                answers.update(generated)
+            except Exception as e:
+                logging.warning(f"Flan-T5 extraction of '{field}' failed: {e}")
+
+        for i in todo:
+            if answers.get(keys[i]):
+                results[i][field] = answers[keys[i]]
+
+    logging.info(f"Extracted {len(fields)} insight fields for {len(todo)} summaries.")
+    return results
+
+def extract_insights_batch(summaries: List[str], workers: Optional[int] = None,
+                           mode: str = "fields") -> List[Dict[str, str]]:
+    """
+    Extracts insights for many summaries, across worker processes when workers > 1.
+
+    Args:
+        summaries (List[str]): Paper summaries.
+        workers (int): Worker processes (default: INFERENCE_WORKERS).
+        mode (str): "fields" (one batched question per field) or "json" (legacy single pass).
+
+    Returns:
+        List[Dict[str, str]]: Insights in the same order as `summaries`.
+    """
+    workers = workers or INFERENCE_WORKERS
+    if workers > 1 and len(summaries) > 1:
+        return parallel_insights(summaries, workers, mode=mode)
+    if mode == "json":
+        return [extract_insights_with_flan(summary) for summary in summaries]
+    return extract_insight_fields(summaries)
@@ -1,65 +1,185 @@
-from datetime import datetime
-from typing import List, Dict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional
 import logging
 import heapq
 
+import numpy as np
+
+from src.pipeline.records import Item
+
+DEFAULT_WEIGHTS = {"recency": 0.5, "relevance": 0.5}
+
+@lru_cache(maxsize=65536)
+def parse_timestamp(value: str) -> Optional[float]:
+    """
+    Parses NewsAPI/arXiv ISO 8601 (and RFC 2822) dates to a UTC epoch, with caching.
+
+    Returns:
+        Optional[float]: Seconds since the epoch, or None if unparseable.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def linear_decay(age_days: np.ndarray, window_days: float = 30.0) -> np.ndarray:
+    return np.clip(1 - age_days / window_days, 0.0, 1.0)
+
+def exponential_decay(age_days: np.ndarray, half_life_days: float = 7.0) -> np.ndarray:
+    return np.power(0.5, np.maximum(age_days, 0.0) / half_life_days)
+
+DECAY_FUNCTIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": linear_decay,
+    "exponential": exponential_decay,
+}
+
 def compute_recency_score(published_at: str, date_format: str = "%Y-%m-%dT%H:%M:%SZ") -> float:
     """
     Computes a recency score based on how recently the item was published.
 
     Args:
         published_at (str): Date in ISO 8601 format.
-        date_format (str): Format to parse date string.
+        date_format (str): Format to try if the date is not ISO 8601 / RFC 2822.
 
     Returns:
         float: Recency score between 0 and 1 (1 = most recent).
     """
-    try:
-        pub_date = datetime.strptime(published_at, date_format)
-        days_diff = (datetime.utcnow() - pub_date).days
-        return max(0, 1 - (days_diff / 30))  # decay over ~1 month
-    except Exception as e:
-        logging.warning(f"Failed to parse date '{published_at}': {e}")
-        return 0.0
+    timestamp = parse_timestamp(published_at)
+    if timestamp is None:
+        try:
+            timestamp = datetime.strptime(published_at, date_format).replace(tzinfo=timezone.utc).timestamp()
+        except Exception as e:
+            logging.warning(f"Failed to parse date '{published_at}': {e}")
+            return 0.0
+    days_diff = (datetime.now(timezone.utc).timestamp() - timestamp) // 86400
+    return max(0, 1 - (days_diff / 30))  # decay over ~1 month
 
-def compute_final_score(item: Dict, weights: Dict[str, float]) -> float:
+def compute_final_score(item: Item, weights: Dict[str, float]) -> float:
     """
     Combine recency and relevance to compute final score.
 
     Args:
-        item (Dict): Item with 'published_at' and optional 'relevance_score'
+        item (Item): Item with `published` and `relevance_score`
         weights (Dict): Weights for each component
 
     Returns:
         float: Final score
     """
-    recency = compute_recency_score(item.get("published_at", ""))
-    relevance = item.get("relevance_score", 0.5)  # default neutral relevance
+    recency = compute_recency_score(item.published)
+    relevance = item.relevance_score
 
     score = weights["recency"] * recency + weights["relevance"] * relevance
-    item["score"] = score
+    item.score = score
     return score
 
-def rank_items(items: List[Dict], top_k: int = 5, weights: Dict[str, float] = {"recency": 0.5, "relevance": 0.5}) -> List[Dict]:
+def score_items(items: List[Item], weights: Dict[str, float] = None, decay: str = "linear",
+                source_weights: Optional[Dict[str, float]] = None, now: Optional[float] = None) -> np.ndarray:
+    """
+    Scores all items at once with NumPy and sets `score` on each.
+
+    score = recency_w * decay(age) + relevance_w * relevance + source_w * source_weight
+
+    Args:
+        items (List[Item]): News or papers.
+        weights (Dict[str, float]): 'recency', 'relevance' and optional 'source' weights.
+        decay (str): Name of a DECAY_FUNCTIONS entry.
+        source_weights (Optional[Dict[str, float]]): Per-source weight in [0, 1] (default 0.5).
+        now (Optional[float]): Reference epoch (default: current time).
+
+    Returns:
+        np.ndarray: Scores in item order.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+
+    timestamps = np.array([parse_timestamp(item.published) for item in items], dtype=np.float64)
+    age_days = (now - timestamps) / 86400.0
+    recency = np.nan_to_num(DECAY_FUNCTIONS[decay](age_days), nan=0.0)  # unparseable dates score 0
+    relevance = np.array([item.relevance_score for item in items], dtype=np.float64)
+
+    scores = weights["recency"] * recency + weights["relevance"] * relevance
+    if weights.get("source"):
+        source_weights = source_weights or {}
+        sources = np.array([source_weights.get(item.source or "arxiv", 0.5) for item in items])
+        scores = scores + weights["source"] * sources
+
+    for item, score in zip(items, scores.tolist()):
+        item.score = score
+    return scores
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Returns the indices of the top K scores, highest first, in O(n + k log k).
+    """
+    if top_k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, top_k)[:top_k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+def rank_items(items: List[Item], top_k: int = 5, weights: Dict[str, float] = {"recency": 0.5, "relevance": 0.5},
+               decay: str = "linear", source_weights: Optional[Dict[str, float]] = None) -> List[Item]:
     """
     Rank items by final score and return the top K.
 
     Args:
-        items (List[Dict]): List of news or papers
+        items (List[Item]): List of news or papers
         top_k (int): Number of top items to return
         weights (Dict[str, float]): Weights for scoring
+        decay (str): Recency decay function ('linear' or 'exponential')
+        source_weights (Optional[Dict[str, float]]): Per-source weights, used if weights has 'source'
 
     Returns:
-        List[Dict]: Top K scored and ranked items
+        List[Item]: Top K scored and ranked items
     """
     try:
-        for item in items:
-            compute_final_score(item, weights)
-
-        top_items = heapq.nlargest(top_k, items, key=lambda x: x["score"])
+        if not items:
+            return []
+        scores = score_items(items, weights, decay=decay, source_weights=source_weights)
+        top_items = [items[i] for i in top_k_indices(scores, top_k)]
         logging.info(f"Ranked and selected top {top_k} items.")
         return top_items
 
     except Exception as e:
         logging.error(f"Failed to rank items: {e}")
         return items[:top_k]
+
+class StreamingTopK:
+    """
+    Keeps the top K items of a stream in a bounded min-heap, so memory stays
+    O(K) no matter how many items are pushed.
+    """
+
+    def __init__(self, top_k: int = 5, weights: Dict[str, float] = None):
+        self.top_k = top_k
+        self.weights = weights or {"recency": 0.5, "relevance": 0.5}
+        self._heap = []
+        self._counter = 0  # tie-breaker so dicts are never compared
+
+    def push(self, items: List[Item]):
+        if not items:
+            return
+        scores = score_items(items, self.weights).tolist()
+        for item, score in zip(items, scores):
+            entry = (score, self._counter, item)
+            self._counter += 1
+            if len(self._heap) < self.top_k:
+                heapq.heappush(self._heap, entry)
+            elif entry[0] > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def result(self) -> List[Item]:
+        """
+        Returns:
+            List[Item]: Top K items seen so far, highest score first.
+        """
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
@@ -0,0 +1,99 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.processors.model_registry import get_pipeline, EMBEDDING_MODEL
+from src.pipeline.records import Item
+from src.storage import cache
+
+# Interest profiles items are scored against (name -> description)
+DEFAULT_PROFILES: Dict[str, str] = {
+    "llms": "Large language models, LLM training, fine-tuning, reasoning, prompting and evaluation",
+    "generative": "Generative AI: diffusion models, image, video and audio generation, multimodal models",
+    "agents": "AI agents, tool use, Model Context Protocol (MCP), autonomous and agentic systems",
+    "ml_research": "Machine learning research: new architectures, transformers, datasets and benchmarks",
+}
+
+# In-process embedding cache so re-ranking in one run never re-encodes
+_MEMORY_CACHE_SIZE = 50_000
+_memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_profile_cache: Dict[tuple, np.ndarray] = {}
+
+def item_text(item: Item) -> str:
+    return f"{item.title}. {item.summary or item.content}".strip()
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\n{text}".encode("utf-8")).hexdigest()
+
+def encode_texts(texts: List[str], batch_size: int = 64) -> np.ndarray:
+    """
+    Encodes texts into L2-normalized embeddings, reusing cached vectors per text hash.
+
+    Returns:
+        np.ndarray: float32 matrix of shape (len(texts), dim).
+    """
+    keys = [_text_key(text) for text in texts]
+    vectors: Dict[str, np.ndarray] = {key: _memory_cache[key] for key in keys if key in _memory_cache}
+
+    missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+    if missing:
+        for key, value in cache.get_many("embedding", missing).items():
+            vectors[key] = np.asarray(value, dtype=np.float32)
+
+    to_encode = {key: text for key, text in zip(keys, texts) if key not in vectors}
+    if to_encode:
+        model = get_pipeline(EMBEDDING_MODEL)
+        encoded = model.encode(list(to_encode.values()), batch_size=batch_size,
+                               normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+        new_vectors = dict(zip(to_encode.keys(), encoded))
+        vectors.update(new_vectors)
+        cache.put_many("embedding", {key: vector.round(5).tolist() for key, vector in new_vectors.items()})
+        logging.info(f"Encoded {len(to_encode)} texts ({len(set(keys)) - len(to_encode)} cached).")
+
+    for key in keys:
+        _memory_cache[key] = vectors[key]
+        _memory_cache.move_to_end(key)
+    while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+    if not keys:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.vstack([vectors[key] for key in keys])
+
+def profile_matrix(profiles: Dict[str, str]) -> np.ndarray:
+    cache_key = tuple(sorted(profiles.items()))
+    if cache_key not in _profile_cache:
+        _profile_cache[cache_key] = encode_texts(list(profiles.values()))
+    return _profile_cache[cache_key]
+
+def score_relevance(items: List[Item], profiles: Optional[Dict[str, str]] = None,
+                    batch_size: int = 64) -> List[Item]:
+    """
+    Sets `relevance_score` on each item: the best cosine similarity between the
+    item's title + summary and any interest profile, clipped to [0, 1].
+
+    All items are scored with one (items x dim) @ (dim x profiles) matrix product.
+
+    Args:
+        items (List[Item]): News or papers.
+        profiles (Optional[Dict[str, str]]): Interest profiles (default: DEFAULT_PROFILES).
+        batch_size (int): Encoder batch size.
+
+    Returns:
+        List[Item]: Same list with `relevance_score` set.
+    """
+    if not items:
+        return items
+
+    try:
+        embeddings = encode_texts([item_text(item) for item in items], batch_size=batch_size)
+        similarities = embeddings @ profile_matrix(profiles or DEFAULT_PROFILES).T
+        scores = np.clip(similarities.max(axis=1), 0.0, 1.0)
+        for item, score in zip(items, scores):
+            item.relevance_score = float(score)
+    except Exception as e:
+        logging.warning(f"Relevance scoring failed, keeping default relevance: {e}")
+    return items
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+CACHE_PATH = "data/inference_cache.db"
+
+# Entries not read for this long are evicted (default: 30 days)
+CACHE_TTL_SECONDS = int(os.environ.get("CACHE_TTL_SECONDS", 30 * 24 * 3600))
+# Hard cap on stored entries; least recently used rows are evicted first
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 100_000))
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+_stats = Counter()
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS inference_cache (
+                key TEXT PRIMARY KEY,
+                kind TEXT,
+                value TEXT,
+                created_at REAL,
+                accessed_at REAL
+            )
+        """)
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON inference_cache(accessed_at)")
+        _conn.commit()
+    return _conn
+
+def make_key(model: str, params: Dict, text: str) -> str:
+    """
+    Builds a content-addressed cache key.
+
+    Args:
+        model (str): Model name that produced the value.
+        params (Dict): Generation parameters that affect the output.
+        text (str): Cleaned input text.
+
+    Returns:
+        str: SHA-256 hex digest of model, parameters and text.
+    """
+    base_string = json.dumps([model, params, text], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(base_string.encode("utf-8")).hexdigest()
+
+def get_many(kind: str, keys: Iterable[str]) -> Dict[str, object]:
+    """
+    Looks up several keys at once and records hits/misses for `kind`.
+
+    Returns:
+        Dict[str, object]: Decoded values for the keys that were found.
+    """
+    keys = list(dict.fromkeys(keys))
+    found = {}
+    if not keys:
+        return found
+
+    with _lock:
+        conn = _get_conn()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value FROM inference_cache WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            found.update((key, json.loads(value)) for key, value in rows)
+
+        if found:
+            conn.executemany("UPDATE inference_cache SET accessed_at = ? WHERE key = ?",
+                             [(time.time(), key) for key in found])
+            conn.commit()
+
+    _stats[f"{kind}_hits"] += len(found)
+    _stats[f"{kind}_misses"] += len(keys) - len(found)
+    return found
+
+def put_many(kind: str, values: Dict[str, object]):
+    """
+    Stores several JSON-serializable values under their keys.
+    """
+    if not values:
+        return
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO inference_cache (key, kind, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            [(key, kind, json.dumps(value), now, now) for key, value in values.items()]
+        )
+        conn.commit()
+
+def get(kind: str, key: str):
+    return get_many(kind, [key]).get(key)
+
+def put(kind: str, key: str, value):
+    put_many(kind, {key: value})
+
+def evict(ttl_seconds: int = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES) -> int:
+    """
+    Removes entries older than the TTL, then trims the cache to `max_entries`.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    with _lock:
+        conn = _get_conn()
+        removed = conn.execute("DELETE FROM inference_cache WHERE accessed_at < ?",
+                               (time.time() - ttl_seconds,)).rowcount
+        removed += conn.execute("""
+            DELETE FROM inference_cache WHERE key IN (
+                SELECT key FROM inference_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (max_entries,)).rowcount
+        conn.commit()
+
+    if removed:
+        logging.info(f"Evicted {removed} entries from inference cache.")
+    return removed
+
+def get_stats() -> Dict[str, int]:
+    return dict(_stats)
+
+def log_stats():
+    kinds = sorted({name.rsplit("_", 1)[0] for name in _stats})
+    for kind in kinds:
+        logging.info(f"Cache {kind}: {_stats[kind + '_hits']} hits, {_stats[kind + '_misses']} misses.")
+
+def close():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
@@ -1,109 +1,732 @@
+import json
 import sqlite3
 import logging
-from typing import List, Dict
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
 import os
 
+from src.pipeline.records import Item, from_dict
+
 DB_PATH = "data/news_papers.db"
 
-def init_db():
-    os.makedirs("data", exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+# WAL lets readers (dashboard) run alongside the writer, but needs shared memory and
+# so only works on a local disk; use DELETE when workers share the file over a network
+DB_JOURNAL_MODE = os.environ.get("DB_JOURNAL_MODE", "WAL")
 
+SCHEMA = [
     # News Table
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS news (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT,
-            url TEXT UNIQUE,
-            source TEXT,
-            published_at TEXT,
-            summary TEXT,
-            diagram TEXT,
-            score REAL
-        )
-    """)
-
+    """
+    CREATE TABLE IF NOT EXISTS news (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        url TEXT UNIQUE,
+        source TEXT,
+        published_at TEXT,
+        summary TEXT,
+        diagram TEXT,
+        score REAL
+    )
+    """,
     # Papers Table
-    c.execute("""
-               CREATE TABLE IF NOT EXISTS papers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT,
-            link TEXT UNIQUE,
-            arxiv_id TEXT,
-            published TEXT,
-            authors TEXT,
-            summary TEXT,
-            diagram TEXT,
-            insights TEXT,
-            score REAL
-        )
+    """
+    CREATE TABLE IF NOT EXISTS papers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        link TEXT UNIQUE,
+        arxiv_id TEXT,
+        published TEXT,
+        authors TEXT,
+        summary TEXT,
+        diagram TEXT,
+        insights TEXT,
+        score REAL
+    )
+    """,
+    # Per-source high-water marks for incremental collection
+    """
+    CREATE TABLE IF NOT EXISTS collector_cursors (
+        source TEXT PRIMARY KEY,
+        last_published TEXT,
+        last_id TEXT,
+        updated_at TEXT
+    )
+    """,
+    # MinHash signatures of previously seen items, for near-duplicate detection across runs
+    """
+    CREATE TABLE IF NOT EXISTS minhash_signatures (
+        content_type TEXT,
+        item_key TEXT,
+        signature BLOB,
+        created_at TEXT DEFAULT (datetime('now')),
+        PRIMARY KEY (content_type, item_key)
+    )
+    """,
+    # One row per pipeline run with its instrumentation report (see pipeline/metrics.py)
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id TEXT PRIMARY KEY,
+        started_at TEXT,
+        finished_at TEXT,
+        status TEXT,
+        duration REAL,
+        items_stored INTEGER,
+        peak_rss_mb REAL,
+        report TEXT
+    )
+    """,
+    # Leased work queue for multi-process/multi-host processing (see pipeline/workers.py).
+    # status: pending -> leased -> done -> ranked, or failed after WORK_MAX_ATTEMPTS
+    """
+    CREATE TABLE IF NOT EXISTS work_queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content_type TEXT NOT NULL,
+        item_key TEXT NOT NULL,
+        payload TEXT,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        lease_owner TEXT,
+        lease_expires REAL,
+        enqueued_at REAL,
+        completed_at REAL,
+        error TEXT,
+        UNIQUE (content_type, item_key)
+    )
+    """,
+    # Key-value metadata, e.g. when the last pipeline run finished
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """,
+]
+
+# Indexes backing the dashboard queries (see queries.py); created after column migrations
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_news_score ON news(score DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_news_published ON news(published_at)",
+    "CREATE INDEX IF NOT EXISTS idx_news_source_score ON news(source, score DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_papers_score ON papers(score DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_papers_published ON papers(published)",
+    "CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_work_queue_status ON work_queue(status, lease_expires)",
+]
+
+# Full-text index over stored items. Each FTS table shares rowids with its base
+# table and is kept in sync by triggers, so searches never scan news/papers.
+# Insights are indexed by their values only (not the JSON keys).
+_INSIGHTS_TEXT = """CASE WHEN json_valid({row}.insights)
+    THEN (SELECT group_concat(value, ' ') FROM json_each({row}.insights))
+    ELSE {row}.insights END"""
+
+FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(title, summary, source)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(title, summary, authors, insights)",
+    """
+    CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news BEGIN
+        INSERT INTO news_fts (rowid, title, summary, source) VALUES (new.id, new.title, new.summary, new.source);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE ON news BEGIN
+        DELETE FROM news_fts WHERE rowid = old.id;
+        INSERT INTO news_fts (rowid, title, summary, source) VALUES (new.id, new.title, new.summary, new.source);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news BEGIN
+        DELETE FROM news_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts (rowid, title, summary, authors, insights)
+        VALUES (new.id, new.title, new.summary, new.authors, {_INSIGHTS_TEXT.format(row="new")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE ON papers BEGIN
+        DELETE FROM papers_fts WHERE rowid = old.id;
+        INSERT INTO papers_fts (rowid, title, summary, authors, insights)
+        VALUES (new.id, new.title, new.summary, new.authors, {_INSIGHTS_TEXT.format(row="new")});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+        DELETE FROM papers_fts WHERE rowid = old.id;
+    END
+    """,
+]
+
+# Backfills the FTS tables for rows stored before the index existed
+FTS_BACKFILL = [
+    "INSERT INTO news_fts (rowid, title, summary, source) SELECT id, title, summary, source FROM news",
+    f"""INSERT INTO papers_fts (rowid, title, summary, authors, insights)
+        SELECT id, title, summary, authors, {_INSIGHTS_TEXT.format(row="papers")} FROM papers""",
+]
+
+# Upserts: re-ranked or re-summarized items overwrite their stale score/summary
+NEWS_UPSERT = """
+    INSERT INTO news (title, url, source, published_at, summary, diagram, score)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        title = excluded.title,
+        summary = excluded.summary,
+        diagram = excluded.diagram,
+        score = excluded.score
+"""
+
+PAPERS_UPSERT = """
+    INSERT INTO papers (title, link, arxiv_id, published, authors, summary, diagram, insights, score, categories)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(link) DO UPDATE SET
+        title = excluded.title,
+        summary = excluded.summary,
+        diagram = excluded.diagram,
+        insights = excluded.insights,
+        score = excluded.score
+"""
+
+# A claimed batch must be completed within this many seconds or it is handed to another worker
+WORK_LEASE_SECONDS = float(os.environ.get("WORK_LEASE_SECONDS", 600))
+# Items whose processing failed (or whose lease expired) this many times are parked as 'failed'
+WORK_MAX_ATTEMPTS = int(os.environ.get("WORK_MAX_ATTEMPTS", 3))
+
+# Column holding each content type's natural key (Item.url)
+KEY_COLUMNS = {"news": "url", "papers": "link"}
+
+def serialize_insights(insights) -> str:
+    """
+    Stores insights as a JSON object (older rows hold str(dict); see queries.parse_insights).
+    """
+    return json.dumps(insights if isinstance(insights, dict) else {}, ensure_ascii=False)
+
+def serialize_categories(categories) -> str:
+    # Term strings (PaperItem.categories); feedparser tag dicts are still accepted
+    terms = [c.get("term", "") if isinstance(c, dict) else str(c) for c in categories or []]
+    return ",".join(term for term in terms if term)
+
+class Database:
+    """
+    One SQLite connection per process, migrated once and shared by all pipeline
+    threads. Writes go through `transaction()` so a batch commits atomically.
+
+    A read-only Database (the dashboard's) first brings an older file's schema
+    up to date through a short-lived writable connection, then reopens it with
+    `mode=ro`. The journal mode is left to the pipeline.
+    """
+
+    def __init__(self, path: str = DB_PATH, read_only: bool = False):
+        self.path = path
+        self.read_only = read_only
+        self.lock = threading.RLock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # isolation_level=None: transactions are opened explicitly in transaction()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if read_only:
+            try:
+                self.conn.execute("PRAGMA busy_timeout=5000")
+                self._migrate()
+            except sqlite3.Error as e:
+                logging.warning(f"Could not migrate {path} before opening it read-only: {e}")
+            finally:
+                self.conn.close()
+            uri = f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None)
+            self.conn.execute("PRAGMA busy_timeout=5000")
+            self.conn.execute("PRAGMA cache_size=-32000")
+            return
+        self._configure()
+        self._migrate()
+
+    def _configure(self):
+        self.conn.execute(f"PRAGMA journal_mode={DB_JOURNAL_MODE}")
+        self.conn.execute("PRAGMA synchronous=NORMAL")    # durable at checkpoints, much faster than FULL
+        self.conn.execute("PRAGMA cache_size=-32000")     # ~32 MB page cache
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+
+    def _migrate(self):
+        with self.transaction() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
 
-    """)
-    # Create or update papers table
-    c.execute("PRAGMA table_info(papers)")
-    columns = [col[1] for col in c.fetchall()]
-    if "insights" not in columns:
-        c.execute("ALTER TABLE papers ADD COLUMN insights TEXT")
-    conn.commit()
-    conn.close()
-    logging.info("Database initialized.")
+            # Databases created before insights/categories were stored lack the columns
+            columns = [col[1] for col in conn.execute("PRAGMA table_info(papers)")]
+            if "insights" not in columns:
+                conn.execute("ALTER TABLE papers ADD COLUMN insights TEXT")
+            if "categories" not in columns:
+                conn.execute("ALTER TABLE papers ADD COLUMN categories TEXT")
 
-def save_to_db(content_type: str, items: List[Dict]):
+            for statement in INDEXES:
+                conn.execute(statement)
+
+            has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'").fetchone()
+            for statement in FTS_SCHEMA:
+                conn.execute(statement)
+            if not has_fts:
+                for statement in FTS_BACKFILL:
+                    conn.execute(statement)
+        logging.info("Database initialized.")
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+
+    def query(self, sql: str, params=()) -> List[tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def save_items(self, content_type: str, items: List[Item]) -> int:
+        """
+        Upserts news or papers with one executemany inside one transaction.
+
+        Returns:
+            int: Number of rows written.
+        """
+        if content_type == "news":
+            sql = NEWS_UPSERT
+            rows = [(
+                item.title,
+                item.url,
+                item.source,
+                item.published,
+                item.summary,
+                item.diagram,
+                item.score
+            ) for item in items]
+        elif content_type == "papers":
+            sql = PAPERS_UPSERT
+            rows = [(
+                item.title,
+                item.url,
+                item.arxiv_id,
+                item.published,
+                ", ".join(item.authors),
+                item.summary,
+                item.diagram,
+                serialize_insights(item.insights),
+                item.score,
+                serialize_categories(item.categories)
+            ) for item in items]
+        else:
+            raise ValueError(f"Unsupported content type: {content_type}")
+
+        with self.transaction() as conn:
+            conn.executemany(sql, rows)
+        return len(rows)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+_db: Optional[Database] = None
+_db_pid: Optional[int] = None
+_db_lock = threading.Lock()
+_db_read_only = False
+
+def get_db() -> Database:
+    """
+    Returns this process's shared Database, opening it on first use (or after a
+    fork, or if DB_PATH was changed).
+    """
+    global _db, _db_pid
+    with _db_lock:
+        if (_db is None or _db_pid != os.getpid() or _db.path != DB_PATH
+                or _db.read_only != _db_read_only):
+            _db = Database(DB_PATH, read_only=_db_read_only)
+            _db_pid = os.getpid()
+        return _db
+
+def use_read_only(read_only: bool = True):
+    """
+    Makes this process's shared Database read-only (for readers such as the
+    dashboard): after a one-off schema migration, writes fail and the journal
+    mode is never changed.
+    """
+    global _db_read_only
+    with _db_lock:
+        _db_read_only = read_only
+
+def init_db():
+    get_db()
+
+def save_to_db(content_type: str, items: List[Item]) -> bool:
     """
     Save ranked news or papers to SQLite database.
 
     Args:
         content_type (str): 'news' or 'papers'
-        items (List[Dict]): List of dicts with fields to save
+        items (List[Item]): NewsItem or PaperItem records to save
+
+    Returns:
+        bool: False if the items could not be saved (the error is logged).
     """
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    if content_type not in KEY_COLUMNS:
+        logging.warning(f"Unsupported content type: {content_type}")
+        return False
 
     try:
-        if content_type == "news":
-            for item in items:
-                c.execute("""
-                    INSERT OR IGNORE INTO news (title, url, source, published_at, summary, diagram, score)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    item.get("title"),
-                    item.get("url"),
-                    item.get("source"),
-                    item.get("published_at"),
-                    item.get("summary"),
-                    item.get("diagram", ""),
-                    item.get("score", 0.0)
-                ))
+        count = get_db().save_items(content_type, items)
+        logging.info(f"{count} {content_type} entries saved to DB.")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to save to DB: {e}")
+        return False
 
-        elif content_type == "papers":
-            for item in items:
-                c.execute("""
-    INSERT OR IGNORE INTO papers (title, link, arxiv_id, published, authors, summary, diagram, insights, score)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-""", (
-                    item.get("title"),
-                    item.get("link"),
-                    item.get("arxiv_id"),
-                    item.get("published"),
-                    ", ".join(item.get("authors", [])),
-                    item.get("summary"),
-                    item.get("diagram", ""),
-                    str(item.get("insights", {})),  # store as stringified dict
-                    item.get("score", 0.0)
-                ))
+def get_cursor(source: str) -> Optional[Dict]:
+    """
+    Returns the stored high-water mark for a collector source, or None on first run.
+    """
+    rows = get_db().query("SELECT last_published, last_id FROM collector_cursors WHERE source = ?", (source,))
+    return {"last_published": rows[0][0], "last_id": rows[0][1]} if rows else None
 
+def update_cursor(source: str, last_published: str, last_id: Optional[str] = None):
+    """
+    Advances a source's high-water mark (never moves it backwards).
+    """
+    with get_db().transaction() as conn:
+        conn.execute("""
+            INSERT INTO collector_cursors (source, last_published, last_id, updated_at)
+            VALUES (?, ?, ?, datetime('now'))
+            ON CONFLICT(source) DO UPDATE SET
+                last_published = excluded.last_published,
+                last_id = excluded.last_id,
+                updated_at = excluded.updated_at
+            WHERE excluded.last_published > collector_cursors.last_published
+        """, (source, last_published, last_id))
+    logging.info(f"Cursor for {source} at {last_published}.")
 
-        else:
-            logging.warning(f"Unsupported content type: {content_type}")
-            return
+def filter_new_items(content_type: str, items: List[Item]) -> List[Item]:
+    """
+    Drops items whose URL (news) or link (papers) is already stored.
 
-        conn.commit()
-        logging.info(f"{len(items)} {content_type} entries saved to DB.")
+    Args:
+        content_type (str): 'news' or 'papers'
+        items (List[Item]): Collected items
 
-    except Exception as e:
-        logging.error(f"Failed to save to DB: {e}")
+    Returns:
+        List[Item]: Items not yet in the database.
+    """
+    column = KEY_COLUMNS[content_type]
+    keys = [item.url for item in items if item.url]
+    if not keys:
+        return items
+
+    db = get_db()
+    known = set()
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = db.query(f"SELECT {column} FROM {content_type} WHERE {column} IN ({placeholders})", chunk)
+        known.update(row[0] for row in rows)
+
+    new_items = [item for item in items if item.url not in known]
+    if known:
+        logging.info(f"Skipped {len(items) - len(new_items)} already stored {content_type} items.")
+    return new_items
+
+def lookup_ids(content_type: str, items: List[Item]) -> List[Optional[int]]:
+    """
+    Returns the stored row id for each item (by url/link), or None if not stored.
+    """
+    column = KEY_COLUMNS[content_type]
+    keys = [item.url for item in items]
+    found = {}
+    for start in range(0, len(keys), 500):
+        chunk = [key for key in keys[start:start + 500] if key]
+        if not chunk:
+            continue
+        placeholders = ",".join("?" * len(chunk))
+        found.update(get_db().query(f"SELECT {column}, id FROM {content_type} WHERE {column} IN ({placeholders})",
+                                    chunk))
+    return [found.get(key) for key in keys]
+
+def save_signatures(content_type: str, signatures: Dict):
+    """
+    Persists MinHash signatures (numpy uint32 arrays) keyed by item url/link.
+    """
+    if not signatures:
+        return
+    with get_db().transaction() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO minhash_signatures (content_type, item_key, signature) VALUES (?, ?, ?)",
+            [(content_type, key, signature.tobytes()) for key, signature in signatures.items()]
+        )
+
+def load_signatures(content_type: str, index, max_age_days: int = 30) -> int:
+    """
+    Inserts stored MinHash signatures from the last `max_age_days` into an LSH index.
+
+    Returns:
+        int: Number of signatures loaded.
+    """
+    import numpy as np
+
+    rows = get_db().query("""
+        SELECT item_key, signature FROM minhash_signatures
+        WHERE content_type = ? AND created_at >= datetime('now', ?)
+    """, (content_type, f"-{max_age_days} days"))
+
+    for key, blob in rows:
+        index.insert(key, np.frombuffer(blob, dtype=np.uint32))
+    logging.info(f"Loaded {len(rows)} {content_type} signatures for near-duplicate detection.")
+    return len(rows)
+
+def enqueue_items(content_type: str, items: List[Item]) -> int:
+    """
+    Adds cleaned items to the work queue. Items already queued (in any state)
+    are ignored, so re-collecting a page never creates duplicate work.
+
+    Returns:
+        int: Number of items newly queued.
+    """
+    now = time.time()
+    with get_db().transaction() as conn:
+        before = conn.total_changes
+        conn.executemany("""
+            INSERT INTO work_queue (content_type, item_key, payload, enqueued_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(content_type, item_key) DO NOTHING
+        """, [(content_type, item.url, json.dumps(item.to_dict(), ensure_ascii=False), now)
+              for item in items if item.url])
+        queued = conn.total_changes - before
+    logging.info(f"Queued {queued} of {len(items)} {content_type} items.")
+    return queued
+
+def claim_batch(worker_id: str, batch_size: int = 16, lease_seconds: float = WORK_LEASE_SECONDS,
+                content_type: Optional[str] = None) -> List[Tuple[int, Item]]:
+    """
+    Leases up to `batch_size` pending items (or items whose lease expired) to `worker_id`.
+
+    The select and the update run in one IMMEDIATE transaction, which takes
+    SQLite's write lock, so two workers can never lease the same item.
+
+    Returns:
+        List[Tuple[int, Item]]: (job id, item) pairs, oldest first.
+    """
+    now = time.time()
+    type_filter = "AND content_type = ?" if content_type else ""
+    params = (now, WORK_MAX_ATTEMPTS, *([content_type] if content_type else []), batch_size)
+    with get_db().transaction() as conn:
+        rows = conn.execute(f"""
+            SELECT id, content_type, payload FROM work_queue
+            WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) AND attempts < ? {type_filter}
+            ORDER BY id LIMIT ?
+        """, params).fetchall()
+        conn.executemany("""
+            UPDATE work_queue SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+            WHERE id = ?
+        """, [(worker_id, now + lease_seconds, row[0]) for row in rows])
+    return [(job_id, from_dict(row_type, json.loads(payload))) for job_id, row_type, payload in rows]
+
+def extend_leases(worker_id: str, job_ids: List[int], lease_seconds: float = WORK_LEASE_SECONDS) -> int:
+    """
+    Renews the leases `worker_id` still holds, e.g. between stages of a long batch.
+
+    Returns:
+        int: Number of leases renewed (fewer if some were taken over).
+    """
+    with get_db().transaction() as conn:
+        before = conn.total_changes
+        conn.executemany("""
+            UPDATE work_queue SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?
+        """, [(time.time() + lease_seconds, job_id, worker_id) for job_id in job_ids])
+        return conn.total_changes - before
+
+def complete_jobs(worker_id: str, results: Dict[int, Item]) -> int:
+    """
+    Stores processed items and marks their jobs done.
+
+    Only the current lease owner (or anyone, while a job is back to pending)
+    can complete a job: a worker that lost its lease to another worker does not
+    overwrite the new owner's result. Repeating a commit changes nothing for
+    jobs that are already done.
+
+    Returns:
+        int: Number of jobs completed by this call.
+    """
+    now = time.time()
+    with get_db().transaction() as conn:
+        before = conn.total_changes
+        conn.executemany("""
+            UPDATE work_queue SET status = 'done', payload = ?, completed_at = ?, lease_owner = ?,
+                lease_expires = NULL, error = NULL
+            WHERE id = ? AND (status = 'pending' OR (status = 'leased' AND lease_owner = ?))
+        """, [(json.dumps(item.to_dict(), ensure_ascii=False), now, worker_id, job_id, worker_id)
+              for job_id, item in results.items()])
+        completed = conn.total_changes - before
+    if completed < len(results):
+        logging.info(f"{len(results) - completed} jobs were already completed or re-leased by another worker.")
+    return completed
+
+def fail_jobs(worker_id: str, job_ids: List[int], error: str) -> int:
+    """
+    Releases jobs whose processing failed: back to pending, or 'failed' once
+    they have been attempted WORK_MAX_ATTEMPTS times.
+    """
+    with get_db().transaction() as conn:
+        before = conn.total_changes
+        conn.executemany("""
+            UPDATE work_queue SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                lease_owner = NULL, lease_expires = NULL, error = ?
+            WHERE id = ? AND status = 'leased' AND lease_owner = ?
+        """, [(WORK_MAX_ATTEMPTS, error[:500], job_id, worker_id) for job_id in job_ids])
+        return conn.total_changes - before
+
+def requeue_expired() -> int:
+    """
+    Returns items whose lease ran out (a worker died or stalled) to pending, or
+    parks them as 'failed' after WORK_MAX_ATTEMPTS.
+
+    Returns:
+        int: Number of leases released.
+    """
+    with get_db().transaction() as conn:
+        released = conn.execute("""
+            UPDATE work_queue SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                lease_owner = NULL, lease_expires = NULL, error = 'lease expired'
+            WHERE status = 'leased' AND lease_expires < ?
+        """, (WORK_MAX_ATTEMPTS, time.time())).rowcount
+    if released:
+        logging.warning(f"Released {released} expired work queue leases.")
+    return released
+
+def release_leases(worker_ids: List[str]) -> int:
+    """
+    Returns the leased items of workers known to be dead (e.g. a crashed local
+    worker process) to pending without waiting for their leases to expire, or
+    parks them as 'failed' after WORK_MAX_ATTEMPTS.
+
+    Returns:
+        int: Number of leases released.
+    """
+    if not worker_ids:
+        return 0
+    placeholders = ",".join("?" * len(worker_ids))
+    with get_db().transaction() as conn:
+        released = conn.execute(f"""
+            UPDATE work_queue SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                lease_owner = NULL, lease_expires = NULL, error = 'worker exited'
+            WHERE status = 'leased' AND lease_owner IN ({placeholders})
+        """, (WORK_MAX_ATTEMPTS, *worker_ids)).rowcount
+    if released:
+        logging.warning(f"Released {released} leases held by exited workers.")
+    return released
+
+def fetch_completed(content_type: str) -> List[Tuple[int, Item]]:
+    """
+    Returns processed items that have not been ranked yet, as (job id, item).
+    """
+    rows = get_db().query(
+        "SELECT id, payload FROM work_queue WHERE status = 'done' AND content_type = ? ORDER BY id", (content_type,))
+    return [(job_id, from_dict(content_type, json.loads(payload))) for job_id, payload in rows]
+
+def mark_ranked(job_ids: List[int]):
+    with get_db().transaction() as conn:
+        conn.executemany("UPDATE work_queue SET status = 'ranked' WHERE id = ? AND status = 'done'",
+                         [(job_id,) for job_id in job_ids])
+
+def queue_counts() -> Dict[str, int]:
+    """
+    Number of work queue items per status.
+    """
+    return dict(get_db().query("SELECT status, COUNT(*) FROM work_queue GROUP BY status"))
+
+def set_meta(key: str, value: str):
+    with get_db().transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+def get_meta(key: str) -> Optional[str]:
+    rows = get_db().query("SELECT value FROM meta WHERE key = ?", (key,))
+    return rows[0][0] if rows else None
+
+def mark_run_completed():
+    """
+    Records that a pipeline run finished; the dashboard uses this to invalidate its caches.
+    """
+    from datetime import datetime, timezone
+    set_meta("last_run_completed", datetime.now(timezone.utc).isoformat())
+
+def save_run(report: Dict):
+    """
+    Stores a pipeline run report (see metrics.RunMetrics.report) in the runs table.
+    """
+    items_stored = report["stages"].get("store", {}).get("items_out", 0)
+    with get_db().transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+            report["run_id"], report["started_at"], report["finished_at"], report["status"],
+            report["duration"], items_stored, report["peak_rss_mb"], json.dumps(report, ensure_ascii=False)
+        ))
+
+# Columns returned by search() for each content type
+SEARCH_COLUMNS = {
+    "news": ("url", "source", "published_at"),
+    "papers": ("link", "authors", "published"),
+}
+# bm25 column weights: title matches count most
+SEARCH_WEIGHTS = {"news": "10.0, 2.0, 1.0", "papers": "10.0, 2.0, 3.0, 1.0"}
+
+def build_fts_query(text: str) -> str:
+    """
+    Turns free text into a safe FTS5 query: every word is quoted (so '-', ':' or
+    'AND' can't break the syntax), words are ANDed, and the last one is a prefix.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+def search(text: str, content_type: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    """
+    Full-text search over stored news and papers with BM25 ranking.
+
+    Args:
+        text (str): Free-text query.
+        content_type (Optional[str]): 'news', 'papers', or None for both.
+        limit (int): Maximum number of results.
+
+    Returns:
+        List[Dict]: Results (best first) with content_type, id, title, url/link,
+        date, bm25 rank and a **highlighted** snippet.
+    """
+    fts_query = build_fts_query(text)
+    if not fts_query:
+        return []
+
+    results = []
+    for kind in ([content_type] if content_type else ["news", "papers"]):
+        link_col, extra_col, date_col = SEARCH_COLUMNS[kind]
+        sql = f"""
+            SELECT b.id, b.title, b.{link_col}, b.{extra_col}, b.{date_col},
+                   bm25({kind}_fts, {SEARCH_WEIGHTS[kind]}) AS rank,
+                   snippet({kind}_fts, -1, '**', '**', '…', 16)
+            FROM {kind}_fts JOIN {kind} b ON b.id = {kind}_fts.rowid
+            WHERE {kind}_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """
+        try:
+            rows = get_db().query(sql, (fts_query, limit))
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Search failed for '{text}': {e}")
+            continue
+        for item_id, title, link, extra, published, rank, snippet in rows:
+            results.append({
+                "content_type": kind, "id": item_id, "title": title, "url": link,
+                extra_col: extra, "published": published, "rank": rank, "snippet": snippet,
+            })
 
-    finally:
-        conn.close()
+    results.sort(key=lambda r: r["rank"])
+    return results[:limit]
@@ -0,0 +1,227 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+HTTP_CACHE_PATH = "data/http_cache.db"
+
+# Stored bodies (compressed) are trimmed to this total, least recently used first
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+
+# Per-source TTLs (s): within it a cached response is reused without any request,
+# which matters for APIs that send no ETag/Last-Modified (NewsAPI)
+SOURCE_TTLS: Dict[str, float] = {
+    "newsapi": float(os.environ.get("NEWSAPI_CACHE_TTL", 15 * 60)),
+    "arxiv": float(os.environ.get("ARXIV_CACHE_TTL", 60 * 60)),  # arXiv publishes once a day
+}
+
+# Query parameters that must never end up in a cache key (or anywhere on disk)
+SECRET_PARAMS = {"apiKey", "apikey", "api_key"}
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+_stats = Counter()
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(HTTP_CACHE_PATH) or ".", exist_ok=True)
+        _conn = sqlite3.connect(HTTP_CACHE_PATH, check_same_thread=False)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB,
+                body_hash TEXT,
+                size INTEGER,
+                fetched_at REAL,
+                accessed_at REAL,
+                source TEXT
+            )
+        """)
+        # Caches created before responses were tagged with their source lack the column
+        if "source" not in [col[1] for col in _conn.execute("PRAGMA table_info(http_cache)")]:
+            _conn.execute("ALTER TABLE http_cache ADD COLUMN source TEXT")
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache(accessed_at)")
+        _conn.commit()
+    return _conn
+
+def cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """
+    Builds the key for a GET request: URL plus sorted query parameters, without secrets.
+
+    Args:
+        url (str): Request URL (may already contain a query string).
+        params (Optional[Dict]): Extra query parameters.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    query = urlencode(sorted((k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS))
+    return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+def lookup(key: str) -> Optional[Dict]:
+    """
+    Returns the cached response for `key` (body decompressed), or None.
+    """
+    with _lock:
+        conn = _get_conn()
+        row = conn.execute(
+            "SELECT etag, last_modified, body, body_hash, fetched_at FROM http_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE http_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+    etag, last_modified, body, body_hash, fetched_at = row
+    return {"etag": etag, "last_modified": last_modified, "body": zlib.decompress(body),
+            "body_hash": body_hash, "fetched_at": fetched_at}
+
+def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+    """
+    If-None-Match / If-Modified-Since headers for revalidating a cached entry.
+    """
+    headers = {}
+    if entry and entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def is_fresh(entry: Optional[Dict], ttl_seconds: float) -> bool:
+    return entry is not None and time.time() - entry["fetched_at"] < ttl_seconds
+
+def store(key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None,
+          source: Optional[str] = None) -> bool:
+    """
+    Stores a 200 response, compressed, tagged with its `source` (see forget_since).
+
+    Returns:
+        bool: True if the body differs from the previously cached one.
+    """
+    body_hash = hashlib.sha256(body).hexdigest()
+    compressed = zlib.compress(body, 6)
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        previous = conn.execute("SELECT body_hash FROM http_cache WHERE key = ?", (key,)).fetchone()
+        conn.execute("""
+            INSERT OR REPLACE INTO http_cache
+                (key, etag, last_modified, body, body_hash, size, fetched_at, accessed_at, source)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (key, etag, last_modified, compressed, body_hash, len(compressed), now, now, source))
+        conn.commit()
+    changed = previous is None or previous[0] != body_hash
+    _stats["changed" if changed else "unchanged"] += 1
+    return changed
+
+def touch(key: str):
+    """
+    Marks a cached entry as revalidated (after a 304), restarting its TTL.
+    """
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        conn.execute("UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+        conn.commit()
+    _stats["not_modified"] += 1
+
+def record_fresh_hit():
+    _stats["fresh"] += 1
+
+def evict(max_bytes: int = HTTP_CACHE_MAX_BYTES) -> int:
+    """
+    Deletes least recently used entries until stored bodies fit in `max_bytes`.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    with _lock:
+        conn = _get_conn()
+        rows = conn.execute("SELECT key, size FROM http_cache ORDER BY accessed_at DESC").fetchall()
+        total, doomed = 0, []
+        for key, size in rows:
+            total += size
+            if total > max_bytes:
+                doomed.append((key,))
+        conn.executemany("DELETE FROM http_cache WHERE key = ?", doomed)
+        conn.commit()
+    if doomed:
+        logging.info(f"Evicted {len(doomed)} responses from HTTP cache.")
+    return len(doomed)
+
+def forget_since(timestamp: float, source: Optional[str] = None) -> int:
+    """
+    Drops responses fetched (or revalidated) at or after `timestamp`, e.g. by a
+    run that failed before storing its results, so the next run sees them as
+    changed and processes them again.
+
+    Args:
+        timestamp (float): Start of the failed run (time.time()).
+        source (Optional[str]): Only forget this source's responses (default: all).
+
+    Returns:
+        int: Number of entries removed.
+    """
+    sql, params = "DELETE FROM http_cache WHERE fetched_at >= ?", [timestamp]
+    if source is not None:
+        sql += " AND source = ?"
+        params.append(source)
+    with _lock:
+        conn = _get_conn()
+        removed = conn.execute(sql, params).rowcount
+        conn.commit()
+    if removed:
+        logging.info(f"Forgot {removed} cached {source or 'HTTP'} responses fetched since the run started.")
+    return removed
+
+def get(url: str, params: Optional[Dict] = None, ttl_seconds: float = 0,
+        timeout: float = 15, source: Optional[str] = None) -> Tuple[bytes, bool]:
+    """
+    Cached, conditional GET with `requests` (for the synchronous collectors).
+
+    A response younger than `ttl_seconds` is served without a request; otherwise
+    the cached validators are sent and a 304 reuses the stored body.
+
+    Returns:
+        Tuple[bytes, bool]: (body, changed) where changed is False when the body
+        is the same as last time (fresh, 304, or an identical 200).
+    """
+    import requests
+
+    key = cache_key(url, params)
+    entry = lookup(key)
+    if is_fresh(entry, ttl_seconds):
+        record_fresh_hit()
+        return entry["body"], False
+
+    response = requests.get(url, params=params, headers=conditional_headers(entry), timeout=timeout)
+    if response.status_code == 304 and entry is not None:
+        touch(key)
+        return entry["body"], False
+    response.raise_for_status()
+    changed = store(key, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                    source=source)
+    return response.content, changed
+
+def get_stats() -> Dict[str, int]:
+    return dict(_stats)
+
+def log_stats():
+    if _stats:
+        logging.info(f"HTTP cache: {_stats['fresh']} fresh, {_stats['not_modified']} not modified, "
+                     f"{_stats['unchanged']} unchanged, {_stats['changed']} changed responses.")
+
+def close():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
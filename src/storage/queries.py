@@ -0,0 +1,144 @@
+import ast
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from src.storage.database import get_db, get_meta
+
+NEWS_COLUMNS = ["id", "title", "url", "source", "published_at", "summary", "diagram", "score"]
+PAPER_COLUMNS = ["id", "title", "link", "arxiv_id", "published", "authors", "summary", "diagram",
+                 "insights", "score", "categories"]
+
+# Keyset cursor: (score, id) of the last row on the previous page
+PageCursor = Optional[Tuple[float, int]]
+
+def parse_insights(value) -> Dict:
+    """
+    Decodes stored insights: JSON objects, or str(dict) rows written by older versions.
+    """
+    if isinstance(value, dict):
+        return value
+    if not value:
+        return {}
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            logging.debug(f"Unparseable insights: {value[:80]}")
+            return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+def data_version() -> str:
+    """
+    Changes whenever a pipeline run completes; pass it to cached readers as a cache key.
+    """
+    return get_meta("last_run_completed") or ""
+
+def _page(table: str, columns: List[str], date_column: str, filters: List[Tuple[str, list]],
+          limit: int, after: PageCursor, since: Optional[str], until: Optional[str]) -> List[Dict]:
+    where, params = [], []
+    for clause, values in filters:
+        where.append(clause)
+        params.extend(values)
+    if since:
+        where.append(f"{date_column} >= ?")
+        params.append(since)
+    if until:
+        where.append(f"{date_column} < ?")
+        params.append(until)
+    if after is not None:
+        # Keyset pagination on the (score DESC, id DESC) index: no OFFSET scans
+        where.append("(score < ? OR (score = ? AND id < ?))")
+        params.extend([after[0], after[0], after[1]])
+
+    sql = f"SELECT {', '.join(columns)} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY score DESC, id DESC LIMIT ?"
+    params.append(limit)
+
+    return [dict(zip(columns, row)) for row in get_db().query(sql, params)]
+
+def fetch_news(limit: int = 10, after: PageCursor = None, since: Optional[str] = None,
+               until: Optional[str] = None, source: Optional[str] = None) -> List[Dict]:
+    """
+    Returns one page of news ordered by score.
+
+    Args:
+        limit (int): Page size.
+        after (PageCursor): (score, id) of the last row of the previous page.
+        since (Optional[str]): Only items published at or after this ISO date.
+        until (Optional[str]): Only items published before this ISO date.
+        source (Optional[str]): Only items from this source.
+
+    Returns:
+        List[Dict]: Rows keyed by column name.
+    """
+    filters = [("source = ?", [source])] if source else []
+    return _page("news", NEWS_COLUMNS, "published_at", filters, limit, after, since, until)
+
+def fetch_papers(limit: int = 10, after: PageCursor = None, since: Optional[str] = None,
+                 until: Optional[str] = None, category: Optional[str] = None) -> List[Dict]:
+    """
+    Returns one page of papers ordered by score, with insights decoded to dicts.
+
+    Args:
+        limit (int): Page size.
+        after (PageCursor): (score, id) of the last row of the previous page.
+        since (Optional[str]): Only papers published at or after this ISO date.
+        until (Optional[str]): Only papers published before this ISO date.
+        category (Optional[str]): Only papers tagged with this arXiv category (e.g. 'cs.CL').
+
+    Returns:
+        List[Dict]: Rows keyed by column name.
+    """
+    filters = [("(',' || categories || ',') LIKE ?", [f"%,{category},%"])] if category else []
+    rows = _page("papers", PAPER_COLUMNS, "published", filters, limit, after, since, until)
+    for row in rows:
+        row["insights"] = parse_insights(row["insights"])
+    return rows
+
+def list_sources() -> List[str]:
+    return [row[0] for row in get_db().query(
+        "SELECT DISTINCT source FROM news WHERE source IS NOT NULL ORDER BY source")]
+
+def list_categories() -> List[str]:
+    categories = set()
+    for (value,) in get_db().query("SELECT DISTINCT categories FROM papers WHERE categories != ''"):
+        categories.update(value.split(","))
+    return sorted(categories)
+
+def fetch_by_ids(content_type: str, ids: List[int]) -> Dict[int, Dict]:
+    """
+    Returns rows keyed by id (e.g. to render vector search hits).
+    """
+    if not ids:
+        return {}
+    columns = NEWS_COLUMNS if content_type == "news" else PAPER_COLUMNS
+    placeholders = ",".join("?" * len(ids))
+    rows = get_db().query(f"SELECT {', '.join(columns)} FROM {content_type} WHERE id IN ({placeholders})", ids)
+    result = {row[0]: dict(zip(columns, row)) for row in rows}
+    if content_type == "papers":
+        for row in result.values():
+            row["insights"] = parse_insights(row["insights"])
+    return result
+
+def fetch_runs(limit: int = 50) -> List[Dict]:
+    """
+    Returns the most recent pipeline runs, oldest first, with per-stage wall times.
+    """
+    rows = get_db().query("""
+        SELECT run_id, started_at, status, duration, items_stored, peak_rss_mb, report
+        FROM runs ORDER BY started_at DESC LIMIT ?
+    """, (limit,))
+    runs = []
+    for run_id, started_at, status, duration, items_stored, peak_rss_mb, report in reversed(rows):
+        stages = json.loads(report).get("stages", {}) if report else {}
+        runs.append({
+            "run_id": run_id, "started_at": started_at, "status": status, "duration": duration,
+            "items_stored": items_stored, "peak_rss_mb": peak_rss_mb,
+            "stage_times": {name: stats.get("wall_time", 0.0) for name, stats in stages.items()},
+        })
+    return runs
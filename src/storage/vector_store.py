@@ -0,0 +1,284 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.pipeline.records import Item
+
+VECTOR_DIR = "data/vectors"
+
+# Content types are stored as small integer codes next to the row id
+TYPE_CODES = {"news": 0, "papers": 1}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+# Use the IVF index once the archive has at least this many vectors
+IVF_MIN_VECTORS = 50_000
+# Rows scored per matrix product during brute-force search
+SCAN_CHUNK = 65_536
+
+class VectorStore:
+    """
+    Append-only, memory-mapped embedding store with cosine top-k search.
+
+    Layout under `path`:
+        vectors.f16   float16 rows of L2-normalized embeddings
+        ids.i64       (type code, row id) int64 pairs, one per vector
+        meta.json     dim and committed row count (written last, so readers
+                      never see a partially appended row; rows past the count,
+                      left by a crash mid-append, are cut off by the next append)
+        ivf_*.npy     optional IVF index (centroids, per-row list assignment)
+
+    Readers map the files instead of loading them, so each Streamlit session
+    shares the OS page cache rather than holding its own copy.
+    """
+
+    def __init__(self, path: str = VECTOR_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._count = -1
+        self._vectors: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self._known: Optional[Dict[Tuple[int, int], int]] = None  # (type code, row id) -> row
+        self._ivf: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+        self.refresh()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_meta(self) -> Dict:
+        try:
+            with open(self._file("meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"dim": 0, "count": 0}
+
+    def __len__(self):
+        return max(self._count, 0)
+
+    def refresh(self):
+        """
+        Re-maps the files if another process appended rows since the last call.
+        """
+        meta = self._read_meta()
+        if meta["count"] == self._count:
+            return
+        self.dim, self._count = meta["dim"], meta["count"]
+        if self._count:
+            self._vectors = np.memmap(self._file("vectors.f16"), dtype=np.float16, mode="r",
+                                      shape=(self._count, self.dim))
+            self._ids = np.memmap(self._file("ids.i64"), dtype=np.int64, mode="r", shape=(self._count, 2))
+        else:
+            self._vectors = np.empty((0, self.dim), dtype=np.float16)
+            self._ids = np.empty((0, 2), dtype=np.int64)
+        self._known = None
+        self._ivf = self._load_ivf()
+
+    def append(self, content_type: str, ids: List[int], vectors: np.ndarray, replace: bool = False) -> int:
+        """
+        Appends embeddings for stored rows. Rows already indexed are skipped, or
+        with `replace` overwritten in place (e.g. after an upsert changed the summary).
+
+        Returns:
+            int: Number of vectors written.
+        """
+        with self._lock:
+            self.refresh()
+            if self._known is None:
+                self._known = {(int(t), int(i)): row for row, (t, i) in enumerate(self._ids)}
+            code = TYPE_CODES[content_type]
+            matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+            if self.dim and matrix.shape[1] != self.dim:
+                raise ValueError(f"Embedding dim {matrix.shape[1]} does not match store dim {self.dim}")
+
+            new = [(int(i), v) for i, v in zip(ids, matrix) if (code, int(i)) not in self._known]
+            updates = [(self._known[(code, int(i))], v) for i, v in zip(ids, matrix)
+                       if (code, int(i)) in self._known] if replace else []
+            if not new and not updates:
+                return 0
+
+            dim = matrix.shape[1]
+            os.makedirs(self.path, exist_ok=True)
+            if updates:
+                with open(self._file("vectors.f16"), "r+b") as f:
+                    for row, vector in updates:
+                        f.seek(row * dim * 2)
+                        f.write(vector.astype(np.float16).tobytes())
+                self._reassign(updates)
+
+            if new:
+                # Cut off rows a crashed append wrote past the committed count, so vectors and ids stay aligned
+                for name, row_bytes in (("vectors.f16", dim * 2), ("ids.i64", 16)):
+                    with open(self._file(name), "ab") as f:
+                        f.truncate(self._count * row_bytes)
+                        f.write(np.array([v for _, v in new], dtype=np.float16).tobytes() if name == "vectors.f16"
+                                else np.array([(code, i) for i, _ in new], dtype=np.int64).tobytes())
+
+                meta = {"dim": dim, "count": self._count + len(new)}
+                tmp = self._file("meta.json.tmp")
+                with open(tmp, "w") as f:
+                    json.dump(meta, f)
+                os.replace(tmp, self._file("meta.json"))
+
+                self._known.update(((code, i), self._count + n) for n, (i, _) in enumerate(new))
+                known = self._known
+                self.refresh()
+                self._known = known
+            return len(new) + len(updates)
+
+    def _reassign(self, updates: List[Tuple[int, np.ndarray]]):
+        # Overwritten rows covered by the IVF index move to their new nearest list
+        if self._ivf is None:
+            return
+        centroids, assignments, built_count = self._ivf
+        covered = [(row, vector) for row, vector in updates if row < built_count]
+        if not covered:
+            return
+        assignments = np.array(assignments)
+        for row, vector in covered:
+            assignments[row] = int(np.argmax(centroids @ vector))
+        np.save(self._file("ivf_assignments.npy"), assignments)
+        self._ivf = (centroids, assignments, built_count)
+
+    def vector_for(self, content_type: str, row_id: int) -> Optional[np.ndarray]:
+        self.refresh()
+        matches = np.flatnonzero((self._ids[:, 0] == TYPE_CODES[content_type]) & (self._ids[:, 1] == row_id))
+        return np.asarray(self._vectors[matches[0]], dtype=np.float32) if matches.size else None
+
+    def _scan(self, query: np.ndarray, rows: np.ndarray, top_k: int,
+              type_code: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Brute-force cosine scores for `rows` (indices into the store), chunked.
+        """
+        best_rows, best_scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        for start in range(0, len(rows), SCAN_CHUNK):
+            chunk = rows[start:start + SCAN_CHUNK]
+            scores = np.asarray(self._vectors[chunk], dtype=np.float32) @ query
+            if type_code is not None:
+                scores[self._ids[chunk, 0] != type_code] = -np.inf
+            best_rows = np.concatenate([best_rows, chunk])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best_rows) > top_k:
+                keep = np.argpartition(-best_scores, top_k)[:top_k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+        return best_rows, best_scores
+
+    def search(self, query: np.ndarray, top_k: int = 10, content_type: Optional[str] = None,
+               nprobe: int = 8, exclude: Optional[Tuple[str, int]] = None) -> List[Tuple[str, int, float]]:
+        """
+        Cosine top-k search. Uses the IVF index for large archives (probing the
+        `nprobe` closest lists, plus rows appended after it was built) and an
+        exact scan otherwise.
+
+        Returns:
+            List[Tuple[str, int, float]]: (content_type, row id, similarity), best first.
+        """
+        self.refresh()
+        if not self._count:
+            return []
+
+        query = np.asarray(query, dtype=np.float32).ravel()
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        type_code = TYPE_CODES[content_type] if content_type else None
+
+        if self._ivf is not None and self._count >= IVF_MIN_VECTORS:
+            centroids, assignments, built_count = self._ivf
+            lists = np.argsort(-(centroids @ query))[:nprobe]
+            rows = np.flatnonzero(np.isin(assignments, lists))
+            rows = np.concatenate([rows, np.arange(built_count, self._count)])
+        else:
+            rows = np.arange(self._count)
+
+        candidates, scores = self._scan(query, rows, top_k + 1, type_code)
+        order = np.argsort(-scores)
+        results = []
+        for index in order:
+            if not np.isfinite(scores[index]):
+                continue
+            code, row_id = self._ids[candidates[index]]
+            result = (TYPE_NAMES[int(code)], int(row_id), float(scores[index]))
+            if exclude and result[:2] == exclude:
+                continue
+            results.append(result)
+            if len(results) == top_k:
+                break
+        return results
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, sample: int = 100_000, seed: int = 0):
+        """
+        Builds an IVF index with spherical k-means over a sample of the vectors.
+        Rows appended later are still found (they are scanned exactly until the next build).
+        """
+        self.refresh()
+        n_lists = n_lists or max(2, int(np.sqrt(self._count)))
+        if self._count < n_lists:
+            return
+        rng = np.random.default_rng(seed)
+
+        sample_rows = np.sort(rng.choice(self._count, size=min(sample, self._count), replace=False))
+        data = np.asarray(self._vectors[sample_rows], dtype=np.float32)
+        centroids = data[rng.choice(len(data), size=n_lists, replace=False)]
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for k in range(n_lists):
+                members = data[labels == k]
+                if len(members):
+                    centroids[k] = members.mean(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        assignments = np.empty(self._count, dtype=np.int32)
+        for start in range(0, self._count, SCAN_CHUNK):
+            chunk = np.asarray(self._vectors[start:start + SCAN_CHUNK], dtype=np.float32)
+            assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+
+        np.save(self._file("ivf_centroids.npy"), centroids)
+        np.save(self._file("ivf_assignments.npy"), assignments)
+        self._ivf = (centroids, assignments, self._count)
+        logging.info(f"Built IVF index with {n_lists} lists over {self._count} vectors.")
+
+    def _load_ivf(self) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+        try:
+            centroids = np.load(self._file("ivf_centroids.npy"))
+            assignments = np.load(self._file("ivf_assignments.npy"), mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        return centroids, assignments, len(assignments)
+
+_store: Optional[VectorStore] = None
+
+def get_store() -> VectorStore:
+    global _store
+    if _store is None or _store.path != VECTOR_DIR:
+        _store = VectorStore(VECTOR_DIR)
+    return _store
+
+def index_items(content_type: str, items: List[Item]) -> int:
+    """
+    Embeds stored items (title + summary) and writes them to the vector store.
+    Items indexed before are re-embedded in place, since the upsert that just
+    stored them may have changed their summary. Rebuilds the IVF index when the
+    archive has doubled since the last build.
+
+    Returns:
+        int: Number of vectors written.
+    """
+    from src.ranking.relevance import encode_texts, item_text
+    from src.storage.database import lookup_ids
+
+    ids = lookup_ids(content_type, items)
+    pairs = [(row_id, item) for row_id, item in zip(ids, items) if row_id is not None]
+    if not pairs:
+        return 0
+
+    store = get_store()
+    vectors = encode_texts([item_text(item) for _, item in pairs])
+    added = store.append(content_type, [row_id for row_id, _ in pairs], vectors, replace=True)
+
+    built = store._ivf[2] if store._ivf is not None else 0
+    if len(store) >= IVF_MIN_VECTORS and len(store) >= 2 * built:
+        store.build_ivf()
+    logging.info(f"Indexed {added} {content_type} embeddings ({len(store)} total).")
+    return added
@@ -1,76 +1,226 @@
-import json
+from datetime import timedelta
 
 import streamlit as st
-import sqlite3
-from pathlib import Path
 
-DB_PATH = "data/news_papers.db"
+from src.storage import queries
+from src.storage.database import search, use_read_only
+from src.storage.vector_store import get_store
 
-def load_data(content_type: str):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+PAGE_SIZE = 10
 
+@st.cache_resource
+def get_vector_store():
+    # Memory-mapped: shared by all sessions, re-mapped only when the pipeline appends
+    return get_store()
+
+@st.cache_resource
+def get_encoder():
+    from src.ranking.relevance import encode_texts
+    return encode_texts
+
+def current_data_version() -> str:
+    # One indexed lookup per rerun, so pages refresh as soon as a run completes
+    return queries.data_version()
+
+@st.cache_data(max_entries=256)
+def load_page(content_type: str, version: str, after, since, until, source, category):
+    # `version` is only part of the cache key: a finished pipeline run invalidates old pages
     if content_type == "news":
-        cursor.execute("SELECT title, url, source, published_at, summary, diagram, score FROM news ORDER BY score DESC LIMIT 10")
-    elif content_type == "papers":
-        cursor.execute("SELECT title, link, arxiv_id, published, authors, summary, diagram, insights, score FROM papers ORDER BY score DESC LIMIT 10")
-    else:
-        return []
-
-    rows = cursor.fetchall()
-    conn.close()
+        return queries.fetch_news(PAGE_SIZE, after=after, since=since, until=until, source=source)
+    return queries.fetch_papers(PAGE_SIZE, after=after, since=since, until=until, category=category)
+
+@st.cache_data
+def load_filter_options(version: str):
+    return queries.list_sources(), queries.list_categories()
+
+def paged_rows(content_type: str, filters: dict):
+    """
+    Renders prev/next controls and returns the rows of the current page.
+    Pages are addressed by keyset cursors kept in session state.
+    """
+    state_key = f"{content_type}_cursors"
+    filter_key = f"{content_type}_filters"
+    if st.session_state.get(filter_key) != filters:
+        st.session_state[filter_key] = filters
+        st.session_state[state_key] = [None]
+
+    cursors = st.session_state[state_key]
+    rows = load_page(content_type, current_data_version(), cursors[-1], **filters)
+
+    col_prev, col_page, col_next = st.columns([1, 1, 1])
+    if col_prev.button("⬅️ Previous", key=f"{content_type}_prev", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    col_page.caption(f"Page {len(cursors)}")
+    if col_next.button("Next ➡️", key=f"{content_type}_next", disabled=len(rows) < PAGE_SIZE):
+        cursors.append((rows[-1]["score"], rows[-1]["id"]))
+        st.rerun()
     return rows
 
-def display_news():
+def display_news(filters: dict):
     st.subheader("📰 Top News Articles")
-    articles = load_data("news")
-
-    for title, url, source, published, summary, diagram, score in articles:
-        st.markdown(f"### [{title}]({url})")
-        st.caption(f"**Source:** {source} | **Published:** {published} | **Score:** {score:.2f}")
-        st.write(summary)
-        if diagram:
-            st.markdown(diagram)
+    articles = paged_rows("news", filters)
+
+    for article in articles:
+        st.markdown(f"### [{article['title']}]({article['url']})")
+        st.caption(f"**Source:** {article['source']} | **Published:** {article['published_at']} | "
+                   f"**Score:** {article['score']:.2f}")
+        st.write(article["summary"])
+        if article["diagram"]:
+            st.markdown(article["diagram"])
         st.markdown("---")
 
-def display_papers():
+def display_papers(filters: dict):
     st.subheader("📄 Top Research Papers")
-    papers = load_data("papers")
+    papers = paged_rows("papers", filters)
 
-    for title, link, arxiv_id, published, authors, summary, diagram, insights_str, score in papers:
-        with st.expander(f"📘 {title}"):
-            st.markdown(f"[🔗 View Full Paper]({link})", unsafe_allow_html=True)
-            st.caption(f"**Authors:** {authors} | **Published:** {published} | **Score:** {score:.2f}")
+    for paper in papers:
+        with st.expander(f"📘 {paper['title']}"):
+            st.markdown(f"[🔗 View Full Paper]({paper['link']})", unsafe_allow_html=True)
+            st.caption(f"**Authors:** {paper['authors']} | **Published:** {paper['published']} | "
+                       f"**Score:** {paper['score']:.2f}")
 
             st.markdown("### 📝 Summary")
-            st.write(summary)
-
-            try:
-                insights = json.loads(insights_str) if isinstance(insights_str, str) else {}
-                if insights:
-                    st.markdown("### 🔍 Extracted Research Insights")
-                    for key, value in insights.items():
-                        st.markdown(f"- **{key}:** {value}")
-                else:
-                    st.info("No insights available.")
-            except Exception:
-                st.warning("Could not parse insights.")
-
-            if diagram:
+            st.write(paper["summary"])
+
+            insights = paper["insights"]
+            if insights:
+                st.markdown("### 🔍 Extracted Research Insights")
+                for key, value in insights.items():
+                    st.markdown(f"- **{key}:** {value}")
+            else:
+                st.info("No insights available.")
+
+            if paper["diagram"]:
                 st.markdown("### 📊 Architecture Diagram")
-                st.markdown(diagram)
+                st.markdown(paper["diagram"])
+
+            if st.button("🔁 More like this", key=f"similar_{paper['id']}"):
+                more_like_this("papers", paper["id"])
 
             st.markdown("---")
+
+@st.cache_data(max_entries=128)
+def run_search(text: str, content_type, version: str):
+    return search(text, content_type=content_type, limit=30)
+
+def display_search():
+    col_query, col_type = st.columns([4, 1])
+    text = col_query.text_input("🔎 Search the archive", placeholder="e.g. diffusion transformer, MCP agents")
+    scope = col_type.selectbox("In", ["All", "News", "Papers"])
+    if not text.strip():
+        return False
+
+    content_type = {"All": None, "News": "news", "Papers": "papers"}[scope]
+    results = run_search(text.strip(), content_type, current_data_version())
+    st.subheader(f"Search results for “{text.strip()}” ({len(results)})")
+    if not results:
+        st.info("No matches.")
+    for result in results:
+        icon = "📰" if result["content_type"] == "news" else "📘"
+        st.markdown(f"{icon} **[{result['title']}]({result['url']})**")
+        st.caption(f"**Published:** {result['published']}")
+        st.markdown(result["snippet"])
+    st.markdown("---")
+    return True
+
+def semantic_hits(query_vector, content_type=None, exclude=None, top_k: int = 10):
+    hits = get_vector_store().search(query_vector, top_k=top_k, content_type=content_type, exclude=exclude)
+    rows = {}
+    for kind in ("news", "papers"):
+        rows.update({(kind, row_id): row for row_id, row in
+                     queries.fetch_by_ids(kind, [row_id for k, row_id, _ in hits if k == kind]).items()})
+    return [(kind, rows[(kind, row_id)], similarity) for kind, row_id, similarity in hits
+            if (kind, row_id) in rows]
+
+def render_hits(hits):
+    if not hits:
+        st.info("No similar items found.")
+    for kind, row, similarity in hits:
+        icon = "📰" if kind == "news" else "📘"
+        link = row.get("url") or row.get("link")
+        st.markdown(f"{icon} **[{row['title']}]({link})** — similarity {similarity:.2f}")
+        st.caption(row["summary"])
+
+def display_semantic_search():
+    st.subheader("🧭 Semantic Search")
+    st.caption(f"{len(get_vector_store()):,} indexed summaries")
+    text = st.text_input("Describe what you are looking for",
+                         placeholder="papers about making LLM agents use tools reliably")
+    scope = st.radio("Show", ["All", "News", "Papers"], horizontal=True)
+    if text.strip():
+        query_vector = get_encoder()([text.strip()])[0]
+        content_type = {"All": None, "News": "news", "Papers": "papers"}[scope]
+        render_hits(semantic_hits(query_vector, content_type=content_type))
+
+def more_like_this(content_type: str, row_id: int):
+    vector = get_vector_store().vector_for(content_type, row_id)
+    if vector is None:
+        st.info("This item is not in the semantic index yet.")
+        return
+    render_hits(semantic_hits(vector, exclude=(content_type, row_id), top_k=5))
+
+@st.cache_data(ttl=60)
+def load_runs():
+    # Not keyed on the data version: failed runs are recorded too
+    return queries.fetch_runs()
+
+def display_runs():
+    st.subheader("⏱️ Pipeline Runs")
+    runs = load_runs()
+    if not runs:
+        st.info("No instrumented runs yet.")
+        return
+
+    last = runs[-1]
+    col_duration, col_items, col_rss = st.columns(3)
+    col_duration.metric("Last run", f"{last['duration']:.1f} s", help=f"Status: {last['status']}")
+    col_items.metric("Items stored", last["items_stored"])
+    col_rss.metric("Peak RSS", f"{last['peak_rss_mb']:.0f} MB")
+
+    # One bar per run, split by stage, so a slow stage stands out across runs
+    stages = sorted({name for run in runs for name in run["stage_times"]})
+    st.bar_chart({name: {run["started_at"][:16]: run["stage_times"].get(name, 0.0) for run in runs}
+                  for name in stages})
+    st.line_chart({"duration (s)": [run["duration"] for run in runs],
+                   "peak RSS (MB)": [run["peak_rss_mb"] for run in runs]})
+
+def sidebar_filters():
+    sources, categories = load_filter_options(current_data_version())
+
+    st.sidebar.header("Filters")
+    date_range = st.sidebar.date_input("Published between", value=())  # all dates until a range is picked
+    source = st.sidebar.selectbox("News source", ["All"] + sources)
+    category = st.sidebar.selectbox("Paper category", ["All"] + categories)
+
+    since = until = None
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        since = date_range[0].isoformat()
+        until = (date_range[1] + timedelta(days=1)).isoformat()
+
+    dates = {"since": since, "until": until}
+    news_filters = {**dates, "source": None if source == "All" else source, "category": None}
+    paper_filters = {**dates, "source": None, "category": None if category == "All" else category}
+    return news_filters, paper_filters
+
 def main():
     st.set_page_config(page_title="AI/ML News & Research Dashboard", layout="wide")
+    use_read_only()
     st.title("🧠 AI & ML News + Research Paper Summarizer")
     st.markdown("Explore the most relevant and recent updates in AI/ML from top news and research sources.")
 
-    tab1, tab2 = st.tabs(["📰 News", "📄 Research Papers"])
+    news_filters, paper_filters = sidebar_filters()
+    display_search()
+
+    tab1, tab2, tab3, tab4 = st.tabs(["📰 News", "📄 Research Papers", "🧭 Semantic Search", "⏱️ Runs"])
     with tab1:
-        display_news()
+        display_news(news_filters)
     with tab2:
-        display_papers()
+        display_papers(paper_filters)
+    with tab3:
+        display_semantic_search()
+    with tab4:
+        display_runs()
 
 if __name__ == "__main__":
     main()